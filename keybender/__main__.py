@@ -1,8 +1,10 @@
 from keybender import config
 from keybender.knox import KnoX
 from keybender.listener import Listener
-from keybender.event import Event, EventLoop
+from keybender.event import Event, EventLoop, AsyncioEventLoop
 from keybender.rctl import SocketMgr, SocketSender
+from keybender.inotify import FileWatcher
+from keybender.worker import WorkerPool
 import sys
 import os
 import argparse
@@ -45,6 +47,16 @@ class Director:
                             " in the configuration file.",
                             action="append",
                             dest="options", default=[])
+        parser.add_argument("--asyncio",
+                            help="Run the event loop on top of asyncio.",
+                            action="store_true",
+                            dest="asyncio", default=False)
+        parser.add_argument("-w", "--workers", metavar="N", type=int,
+                            help=
+                            "Threads with their own X connection answering the"
+                            " commands of the socket and the consult children,"
+                            " 0 to answer them in the main loop. Default: 1.",
+                            dest="workers", default=1)
         self.options = parser.parse_args()
         if not self.options:
             parser.print_help()
@@ -68,10 +80,22 @@ class Director:
     def __init__(self):
         self.process_args()
         self.knox = KnoX()
-        self.event_loop = EventLoop()
+        # window properties are kept up to date by the events the listener
+        # reads
+        self.knox.enable_property_cache()
+        if self.options.asyncio:
+            self.event_loop = AsyncioEventLoop()
+        else:
+            self.event_loop = EventLoop()
         self.cfg = config.Config(self.knox,
                                  self.options.config, self.event_loop,
                                  extra_options=self.special_options)
+        if self.options.workers > 0:
+            self.workers = WorkerPool(self.cfg, self.event_loop,
+                                      self.options.workers)
+        else:
+            self.workers = None
+        self.cfg.workers = self.workers
         self.cfg.start.execute()
 
         if self.options.socket_path:
@@ -85,9 +109,16 @@ class Director:
         else:
             self.socket = None
 
-        self.event_loop.register(Event.IDLE, self.check_config, timeout=4)
+        if FileWatcher.available():
+            self.watcher = FileWatcher(self.event_loop, self.reload_config,
+                                       self.cfg.watched_paths)
+        else:
+            self.watcher = None
+            self.event_loop.register(Event.IDLE, self.check_config, timeout=4)
 
-        self.ls = Listener(self.knox, self.event_loop, self.cfg.start.triggers)
+        self.knox.keymap_listeners.append(self.keymap_changed)
+        self.ls = Listener(self.knox, self.event_loop, self.cfg.start.triggers,
+                           grab_mode=self.cfg.start.grab_mode)
 
     def main(self):
         while True:
@@ -99,7 +130,7 @@ class Director:
         conn = SocketMgr(conn)
         self.event_loop.register(
             Event.READABLE, self.remote_control_msg,
-            fd=conn, consultant=config.Consultant(self.cfg))
+            fd=conn, consultant=self.cfg.consultant())
 
 
     def remote_control_msg(self, event, event_loop):
@@ -108,21 +139,42 @@ class Director:
             print("CLOSING #%r" % event.fd.fileno(), "==" * 30)
             event.fd.close_rd()
             #event.fd.close()
+            event.consultant.close()
             self.event_loop.unregister(event.key)
         else:
             r = event.consultant.incoming(data.decode().splitlines(),
                                           responder=SocketSender(event.fd, event_loop))
+    def keymap_changed(self, keycodes, modifiers_changed):
+        # modifier bits of the parsed keys may be wrong now, the listener
+        # takes care of keycode changes
+        if modifiers_changed:
+            self.reload_config()
+
     def check_config(self, event, event_loop):
         try:
-            if self.cfg.changed():
-                if self.ls.level > 1:
-                    print("Config file changed, but cannot reload...")
-                else:
-                    print("Config file changed, reloading...")
-                new_cfg = self.cfg.reload()
-                self.ls = Listener(self.knox, self.event_loop, new_cfg.start.triggers)
-                self.cfg = new_cfg
-                event_loop.quit()
+            changed = self.cfg.changed()
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            return
+        if changed:
+            self.reload_config()
+
+    def reload_config(self):
+        try:
+            if self.ls.current.level > 1:
+                print("Config file changed, but cannot reload...")
+            else:
+                print("Config file changed, reloading...")
+            new_cfg = self.cfg.reload()
+            self.ls = Listener(self.knox, self.event_loop, new_cfg.start.triggers,
+                               grab_mode=new_cfg.start.grab_mode)
+            self.cfg = new_cfg
+            if self.workers is not None:
+                new_cfg.workers = self.workers
+                self.workers.reload(new_cfg)
+            if self.watcher is not None:
+                self.watcher.watch(new_cfg.watched_paths)
+            self.event_loop.quit()
         except Exception as e:
             traceback.print_exc(file=sys.stderr)
             #print(e, file=sys.stderr)
@@ -0,0 +1,83 @@
+"""Allocations and time per dispatch of EventLoop, and the size of a handler
+record with data, like the ones of the remote control connections.
+
+13 READABLE handlers are registered: 12 idle socketpairs with a consultant
+attached, like remote control connections, and one always readable pipe
+standing in for the X connection. There's an IDLE timer too. The loop
+dispatches the pipe handler N times; the transient bytes are the
+tracemalloc peak over each next() on process().
+
+    python bench/event_dispatch.py [N]
+
+To compare with another revision, run it from a checkout of that one, for
+example with git worktree.
+"""
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from keybender.event import Event, EventLoop
+
+
+def record_size(eh):
+    size = sys.getsizeof(eh)
+    for name in ('__dict__', '_keys', 'data'):
+        try:
+            v = object.__getattribute__(eh, name)
+        except AttributeError:
+            continue
+        if v is not None:
+            size += sys.getsizeof(v)
+    return size
+
+
+def main(n=20000):
+    loop = EventLoop()
+    pairs = [ socket.socketpair() for _ in range(12) ]
+    for (a, b) in pairs:
+        consultant_key = loop.register(Event.READABLE, lambda e, l: None,
+                                       fd=a, consultant=object())
+    (r, w) = os.pipe()
+    os.write(w, b'x')
+    readable = os.fdopen(r, 'rb', buffering=0)
+    # never read, stays readable
+    key = loop.register(Event.READABLE, lambda e, l: True, fd=readable)
+    loop.register(Event.IDLE, lambda e, l: None, timeout=60)
+
+    events = loop.process()
+    # warm up
+    for _ in range(100):
+        next(events)
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(n):
+        tracemalloc.reset_peak()
+        (before, _) = tracemalloc.get_traced_memory()
+        next(events)
+        (_, top) = tracemalloc.get_traced_memory()
+        peak += top - before
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(n):
+        next(events)
+    elapsed = time.perf_counter() - started
+
+    print("bytes/dispatch  %8.0f" % (peak / n))
+    print("us/dispatch     %8.1f" % (elapsed / n * 1e6))
+    print("bytes/record    %8d" % record_size(loop.find_handler(consultant_key)))
+
+    for (a, b) in pairs:
+        a.close()
+        b.close()
+    readable.close()
+    os.close(w)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
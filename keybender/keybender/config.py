@@ -1,18 +1,20 @@
 import configparser
 import os
 import re
-from Xlib import X
-from keybender.knox import Modifiers, KnoX, Waiter as Sleeper
+from Xlib import X, Xatom
+from keybender.knox import KnoX, Completion, Waiter as Sleeper
 from keybender.event import Event
 from keybender.rctl import StreamSender
 from types import GeneratorType
 from collections.abc import Iterable
 import functools
+import math
 import shlex
 import fnmatch
 import subprocess
 import time, datetime
 import sys
+import traceback
 import fcntl
 import pickle, base64
 
@@ -36,16 +38,15 @@ class Key:
         """
 
         self.knox = knox
-        self._net_modifiers = None
         self.keysym = None
         self.negate = False
-        self.named_modifiers = None
+        self.named_modifiers = knox.modifiers.none
+        # as they were given, for showing them
+        self.modifier_names = list()
 
         if mods:
-            self.named_modifiers = Modifiers(self.knox, mods.all())
-
-        if self.named_modifiers is None:
-            self.named_modifiers = Modifiers(self.knox, None)
+            self.named_modifiers = mods
+            self.modifier_names = [ str(m) for m in mods.all() ]
 
         if descr:
             descr = descr.strip()
@@ -58,12 +59,12 @@ class Key:
                         map(lambda s: s.strip(),
                             descr.split('+'))))
         for (i,n) in enumerate(l):
-            mods = self.knox.modifiers.find(name=n)
+            m = self.knox.modifiers.find(name=n)
             force_keysym = (keysym is True and i == len(l) - 1 and not self.keysym)
-            if mods and not force_keysym:
-                for m in mods:
-                    self.named_modifiers.add(m)
-                    break
+            if m and not force_keysym:
+                if m not in self.named_modifiers:
+                    self.named_modifiers |= m
+                    self.modifier_names.append(str(m))
             elif not self.keysym:
                 self.keysym = self.knox.string_to_keysym(n)
 
@@ -85,12 +86,10 @@ class Key:
     def modifiers(self):
         if not self.negate:
             return self.named_modifiers
-        elif self._net_modifiers is None:
-            self._net_modifiers = ~self.named_modifiers
-        return self._net_modifiers
+        return ~self.named_modifiers
 
     def __str__(self):
-        l = [ str(m) for m in self.named_modifiers.all() ]
+        l = list(self.modifier_names)
         if self.keysym:
             l.append(self.knox.keysym_to_string(self.keysym))
         if self.negate:
@@ -99,10 +98,10 @@ class Key:
             return "+".join(l)
 
     def __eq__(a, b):
-        return a.keysym == b.keysym and a.modifiers.bitmap == b.modifiers.bitmap
+        return a.keysym == b.keysym and a.modifiers.bits == b.modifiers.bits
 
     def __hash__(self):
-        return hash((a.keysym, a.modifiers.bitmap))
+        return hash((self.keysym, self.modifiers.bits))
 
 class Listener(Step):
     def __init__(self, config, section, name=None):
@@ -111,16 +110,31 @@ class Listener(Step):
         self.section = section
         self._name = name
         self._description = None
+        self.timeout = None
+        self.grab_mode = 'exact'
         for e in section:
             if e == 'triggers':
                 self.triggers = Config.Parser.trigger_list(config, section, e)
             elif e == 'mask':
                 pass
+            elif e == 'watch' and isinstance(self, Start):
+                # used by Config
+                pass
+            elif e == 'grab-mode' and isinstance(self, Start):
+                # exact: one grab for every combination of the modifiers
+                # outside the mask, any-modifier: one grab per key
+                self.grab_mode = section[e].strip()
+                if self.grab_mode not in ('exact', 'any-modifier'):
+                    raise Exception("Unknown grab-mode '%s' in section '%s'"
+                                    % (self.grab_mode, section.name))
             elif e == 'execute':
                 action_name = "action:%s" % section[e]
                 self.actions.append(config.action(action_name))
             elif e == 'description':
                 self._description = section[e]
+            elif e == 'timeout':
+                # seconds to wait for the next key of a chord
+                self.timeout = section.getfloat(e)
             elif e == 'comment':
                 pass
             else:
@@ -239,6 +253,10 @@ class Consultant:
 
     def __init__(self, config):
         self.config = config
+        # command running in the background, the ones after it are queued
+        # as (line, responder) until it's done
+        self.running = None
+        self.queued = []
         self.commands = {
             'select-windows': self.select_windows,
             'close': lambda w: self.config.knox.close_window(int(w)),
@@ -266,21 +284,34 @@ class Consultant:
                 self.call_toggle_fn,
                 self.config.knox.maximize_window),
             'geometry': self.geometry,
+            'layout': self.layout,
             'save_state': self.save_state,
             'restore_state': self.restore_state,
             'action': self.call_action,
             'key': self.send_keys,
             'send_keys': self.send_keys,
+            'type': self.type_text,
             'desktop': self.show_desktop,
-            'display_count': self.display_count
+            'display_count': self.display_count,
+            'monitors': self.monitors,
+            'move-to-monitor': self.move_to_monitor,
+            'grabs': self.key_grabs,
         }
 
+    # commands about the state of the main X connection, a worker passes
+    # them to the main loop
+    main_commands = ('grabs',)
+
     def incoming(self, lines, responder=None):
         cnt = 0
         if responder is None:
             responder = lambda x: x
         for s in lines:
             cnt += 1
+            if self.running is not None:
+                # answers go in the order of the commands
+                self.queued.append((s, responder))
+                continue
             found=False
             print("Incoming: %r" % s)
             if s == 'bye':
@@ -291,30 +322,82 @@ class Consultant:
                 prefix = k + ":"
                 if s.startswith(prefix) or s == k:
                     a = s[len(prefix):]
-                    r = self.commands[k](a.strip())
-                    if isinstance(r, str):
-                        responder([r + "\n"])
-                    elif isinstance(r, Iterable):
-                        responder(r)
-                    elif r is None or r is True:
-                        self.config.knox.flush()
-                        responder("OK\n")
-                    elif r is False:
-                        responder("Failed\n")
+                    if k in self.main_commands and self.config.main_loop is not None:
+                        self.config.main_loop(k, a.strip(), responder)
+                        found = True
+                        break
+                    try:
+                        r = self.commands[k](a.strip())
+                    except Exception:
+                        traceback.print_exc()
+                        r = False
+                    if isinstance(r, Completion):
+                        self.wait_for(r, responder)
+                    else:
+                        self.respond(r, responder)
                     found = True
                     break
             if not found:
                 print("Bad command from external process: %r" % s)
         return cnt
 
+    def close(self):
+        pass
+
+    def respond(self, r, responder):
+        if isinstance(r, str):
+            responder([r + "\n"])
+        elif isinstance(r, Iterable):
+            responder(r)
+        elif r is None or r is True:
+            self.config.knox.flush()
+            responder("OK\n")
+        elif r is False:
+            responder("Failed\n")
+
+    def wait_for(self, completion, responder):
+        """Answer when the X server has done it, meanwhile the event loop
+        goes on"""
+        self.running = completion
+        completion.attach(self.config.event_loop)
+        completion.add_done_callback(
+            functools.partial(self.completed, responder))
+
+    def completed(self, responder, completion):
+        self.running = None
+        self.respond(bool(completion.result), responder)
+        queued = self.queued
+        self.queued = []
+        # called from the event dispatch or a timer, nothing may escape
+        # from here, or the other callbacks of the completion don't run
+        for (s, queued_responder) in queued:
+            try:
+                self.incoming([ s ], responder=queued_responder)
+            except Exception:
+                traceback.print_exc()
+                queued_responder("Failed\n")
+
     def call_action(self, s):
         a = self.config.action("action:" + s)
         a.execute()
 
+    def monitor(self, s, win_id):
+        """Monitor named by s, which can be '.' for the one showing the
+        window"""
+        knox = self.config.knox
+        current = knox.monitor_of(win_id)
+        if s == '.':
+            return current
+        m = knox.monitors.find(s, current=current)
+        if m is None:
+            raise Exception("No such monitor: %r" % s)
+        return m
+
     def geometry(self, s):
-        # TODO: WxH, pero tambien *Wx*H para multiplos (float) del workarea
-        # size. accepto ! after numbers (position and size) for using screen
-        # space instead of workarea
+        # WxH, or *Wx*H for multiples (float) of the workarea size. ! after
+        # numbers (position and size) for using screen space instead of
+        # workarea. @monitor at the end to use the workarea and screen space
+        # of that monitor only
         m = re.match(r'^\s*(?P<win_id>\d+)\s+'
                      r'('
                      r'(?P<w_op>[*]\s*)?(?P<width>[.\d]+)\s*(?P<sz_selector_w>[!])?'
@@ -324,14 +407,20 @@ class Consultant:
                      r'('
                      r'\s*(?P<x_sign>[+-]\s*)(?P<x>\d+)\s*(?P<sz_selector_x>[!])?'
                      r'\s*(?P<y_sign>[+-]\s*)(?P<y>\d+)\s*(?P<sz_selector_y>[!])?'
-                     r')?\s*$', s)
+                     r')?'
+                     r'(\s*@\s*(?P<monitor>[-.\w]+))?\s*$', s)
         if not m:
             raise Exception("Syntax error in geometry string: %r'" % s)
         win_id = int(m['win_id'])
         args = dict()
 
-        wa = self.config.knox.usable_workarea()
-        ra = self.config.knox.get_geometry(self.config.knox.root)
+        if m['monitor']:
+            mon = self.monitor(m['monitor'], win_id)
+            wa = self.config.knox.usable_workarea(mon)
+            ra = KnoX.Geometry(mon.x, mon.y, mon.width, mon.height)
+        else:
+            wa = self.config.knox.usable_workarea()
+            ra = self.config.knox.monitors.screen
         w = self.config.knox.get_geometry(win_id)
         f = self.config.knox.get_frame_extents(win_id)
         print("GEOMETRYCA: workarea %r, window %r, frame %r" % (wa, w, f))
@@ -352,7 +441,7 @@ class Consultant:
         if m['x']:
             sz = ra if m['sz_selector_x'] and m['sz_selector_x'] == '!' else wa
             if m['x_sign'] and m['x_sign'].startswith('-'):
-                args['x'] = sz.width - args.get('width', w.width) - int(m['x'])
+                args['x'] = sz.x + sz.width - args.get('width', w.width) - int(m['x'])
                 #args['x'] = sz.width - (args.get('width', w.width) + int(m['x']) + f.left + f.right)
             else:
                 args['x'] = sz.x + int(m['x'])
@@ -361,13 +450,138 @@ class Consultant:
             if m['y_sign'] and m['y_sign'].startswith('-'):
                 # top and bottom seem to be included already
                 #args['y'] = sz.height - (args.get('height', w.height) + f.top + f.bottom) + int(m['y'])
-                args['y'] = sz.height - args.get('height', w.height) - int(m['y'])
+                args['y'] = sz.y + sz.height - args.get('height', w.height) - int(m['y'])
 
             else:
                 args['y'] = sz.y + int(m['y'])
 
         self.config.knox.set_geometry(win_id, **args)
 
+    def layout_windows(self, words):
+        """Window ids, 'active' for the active window and 'desktop' for the
+        normal, not minimized windows of the current desktop"""
+        knox = self.config.knox
+        windows = []
+        for word in words:
+            if word == 'active':
+                w = knox.active_window(id_only=True)
+                if w:
+                    windows.append(w)
+            elif word == 'desktop':
+                desktop = knox.current_desktop()
+                clients = knox.get_prop(knox.root, "_NET_CLIENT_LIST") or []
+                names = ("_NET_WM_DESKTOP", "_NET_WM_WINDOW_TYPE", "_NET_WM_STATE")
+                props = knox.get_props((c, name) for c in clients for name in names)
+                hidden = knox.atom("_NET_WM_STATE_HIDDEN")
+                for c in clients:
+                    d = knox.reply_value(props[(c, "_NET_WM_DESKTOP")])
+                    t = knox.window_type_names(
+                        knox.reply_value(props[(c, "_NET_WM_WINDOW_TYPE")]))
+                    state = knox.reply_value(props[(c, "_NET_WM_STATE")]) or ()
+                    if (d and d[0] == desktop
+                        and (not t or "NORMAL" in t)
+                        and hidden not in state):
+                        windows.append(c)
+            else:
+                windows.append(int(word))
+        return windows
+
+    def layout_cells(self, spec, n, wa):
+        """Frame geometries for n windows in the area wa. spec is one of
+        grid, grid:CxR, columns[:f,...], rows[:f,...] or a comma separated
+        list of WxH+X+Y, all as fractions of the area. Windows beyond the
+        cells given start from the first one again."""
+        (kind, _, arg) = spec.partition(':')
+        fractions = []
+        if kind == 'grid':
+            if arg:
+                (cols, rows) = map(int, arg.split('x'))
+            else:
+                cols = max(math.ceil(math.sqrt(n)), 1)
+                rows = max(math.ceil(n / cols), 1)
+            for i in range(cols * rows):
+                (r, c) = divmod(i, cols)
+                fractions.append((1 / cols, 1 / rows, c / cols, r / rows))
+        elif kind in ('columns', 'rows'):
+            if arg:
+                sizes = [ float(f) for f in arg.split(',') ]
+            else:
+                sizes = [ 1 ] * max(n, 1)
+            total = sum(sizes)
+            at = 0
+            for size in sizes:
+                if kind == 'columns':
+                    fractions.append((size / total, 1, at / total, 0))
+                else:
+                    fractions.append((1, size / total, 0, at / total))
+                at += size
+        else:
+            for cell in spec.split(','):
+                m = re.match(r'^([.\d]+)x([.\d]+)\+([.\d]+)\+([.\d]+)$', cell)
+                if not m:
+                    raise Exception("Syntax error in layout cell: %r" % cell)
+                fractions.append(tuple(map(float, m.groups())))
+        cells = []
+        for i in range(n):
+            (fw, fh, fx, fy) = fractions[i % len(fractions)]
+            x = wa.x + int(round(wa.width * fx))
+            y = wa.y + int(round(wa.height * fy))
+            # from the rounded edges, so neighbours don't overlap or leave gaps
+            right = wa.x + int(round(wa.width * (fx + fw)))
+            bottom = wa.y + int(round(wa.height * (fy + fh)))
+            cells.append(KnoX.Geometry(x, y, right - x, bottom - y))
+        return cells
+
+    def layout(self, s):
+        """<spec> <windows...> [@monitor], see layout_cells and
+        layout_windows. All the windows are moved in one go."""
+        words = s.split()
+        monitor = None
+        if words and words[-1].startswith('@'):
+            monitor = words.pop()[1:]
+        if len(words) < 2:
+            raise Exception("Syntax error in layout command: %r" % s)
+        windows = self.layout_windows(words[1:])
+        if not windows:
+            return
+        if monitor:
+            wa = self.config.knox.usable_workarea(self.monitor(monitor, windows[0]))
+        else:
+            wa = self.config.knox.usable_workarea()
+        cells = self.layout_cells(words[0], len(windows), wa)
+        self.config.knox.place_windows(zip(windows, cells))
+
+    def monitors(self, s):
+        return "monitors %d %s" % (
+            len(self.config.knox.monitors),
+            " ".join("%s:%dx%d+%d+%d%s" % (m.name, m.width, m.height, m.x, m.y,
+                                           "*" if m.primary else "")
+                     for m in self.config.knox.monitors))
+
+    def move_to_monitor(self, s):
+        """<win_id> <n|name|next|prev|primary>, keeping the place of the
+        window relative to the workarea of the monitor"""
+        try:
+            (w, name) = s.split()
+            win_id = int(w)
+        except ValueError:
+            raise Exception("Syntax error in move-to-monitor command: %r" % s)
+        knox = self.config.knox
+        src = knox.usable_workarea(knox.monitor_of(win_id))
+        dst = knox.usable_workarea(self.monitor(name, win_id))
+        g = knox.get_geometry(win_id)
+        f = knox.get_frame_extents(win_id)
+        t = knox.get_window(win_id).translate_coords(knox.root, 0, 0)
+        # where the frame is, not the client window
+        (x, y) = (-t.x - f.left, -t.y - f.top)
+        width = min(g.width, dst.width - f.left - f.right)
+        height = min(g.height, dst.height - f.top - f.bottom)
+        x = dst.x + (x - src.x) * dst.width // max(src.width, 1)
+        y = dst.y + (y - src.y) * dst.height // max(src.height, 1)
+        x = max(dst.x, min(x, dst.x + dst.width - width - f.left - f.right))
+        y = max(dst.y, min(y, dst.y + dst.height - height - f.top - f.bottom))
+        knox.get_window(win_id).configure(x=x, y=y, width=width, height=height)
+
     def show_desktop(self, s):
         if s == '-':
             self.config.knox.show_desktop(action=False)
@@ -428,26 +642,45 @@ class Consultant:
         self.config.knox.restore_state(state)
 
 
-    def send_keys(self, s):
-        ps = s.split(maxsplit=1)
-        if len(ps) != 2:
-            print("Syntax error in key command, missing window id: %r" % s)
-            return False
-        window_id = int(ps[0])
+    def parse_keys(self, s):
         descr_lst = list()
-        for v in shlex.shlex(ps[1], posix=True):
+        for v in shlex.shlex(s, posix=True):
             if (v == '+' and descr_lst) or (descr_lst and descr_lst[-1][-1] == '+'):
                 descr_lst[-1] += v
             else:
                 descr_lst.append(v)
+        keys = []
         for descr in descr_lst:
             k = Key(self.config.knox, descr, origin="incoming command key:%r" % s)
-            self.config.knox.send_key(window_id, k.keysym, k.modifiers)
-        self.config.knox.flush()
+            keys.append((k.keysym, k.modifiers))
+        return keys
+
+    def send_keys(self, s):
+        ps = s.split(maxsplit=1)
+        if len(ps) != 2:
+            print("Syntax error in key command, missing window id: %r" % s)
+            return False
+        window_id = int(ps[0])
+        # parsed and compiled once for each key string
+        self.config.knox.send_keys(window_id, ps[1], self.parse_keys)
+
+    def type_text(self, s):
+        ps = s.split(' ', 1)
+        if len(ps) != 2:
+            print("Syntax error in type command, missing window id: %r" % s)
+            return False
+        window_id = int(ps[0])
+        injector = self.config.knox.key_injector
+        self.config.knox.send_keys(window_id, ('text', ps[1]),
+                                   lambda source: injector.text_keys(source[1]))
 
     def display_count(self, s):
         return "display_count %d" % self.config.knox.display_count
 
+    def key_grabs(self, s):
+        grabs = self.config.knox.key_grabs
+        return "grabs %d %s" % (len(grabs), grabs.stats())
+
 
 class ConsultCommandAction(Action):
     def __init__(self, config, section):
@@ -490,7 +723,7 @@ class ConsultCommandAction(Action):
             fd=child.stdout,
             child=child,
             command=cmd,
-            consultant=Consultant(self.config))
+            consultant=self.config.consultant())
 
     def control_message(self, event, event_loop):
         data = event.fd.read()
@@ -500,6 +733,7 @@ class ConsultCommandAction(Action):
                   "==" * 20)
             event.child.stdout.close()
             event.child.stdin.close()
+            event.consultant.close()
             event_loop.unregister(event.key)
         else:
             event.consultant.incoming(
@@ -725,8 +959,10 @@ class WindowFinder:
                 }
                 return ops[op](*args)
 
-        def __init__(self, section, entry, getter):
+        def __init__(self, section, entry, getter, prop):
             self.getter = getter
+            # read for every window in one batch before matching
+            self.prop = prop
             self.expression = Expression(section[entry], self.Translator())
 
 
@@ -734,20 +970,30 @@ class WindowFinder:
             value = self.getter(window)
             return self.expression(value)
 
+    def prop(self, window, name):
+        """Property of the window read by the batch in __call__"""
+        k = (self.config.knox.window_id(window), name)
+        if self.props is not None and k in self.props:
+            return self.props[k]
+        return self.config.knox.get_props([ k ])[k]
+
     def get_name(self, window):
-        return self.config.knox.get_wm_name(window)
+        return self.config.knox.reply_text(self.prop(window, Xatom.WM_NAME))
     def get_class(self, window):
-        cls = window.get_wm_class()
+        cls = self.config.knox.reply_wm_class(self.prop(window, Xatom.WM_CLASS))
         return cls[-1] if cls else None
     def get_instance(self, window):
-        cls = window.get_wm_class()
+        cls = self.config.knox.reply_wm_class(self.prop(window, Xatom.WM_CLASS))
         return cls[0] if cls else None
 
     def get_pid(self, window):
-        return str(self.config.knox.get_wm_pid(window))
+        pid = self.config.knox.reply_value(self.prop(window, "_NET_WM_PID"))
+        return str(pid[0] if pid else None)
 
     def get_type(self, window):
-        type_details = self.config.knox.get_window_type(window)
+        types = self.config.knox.reply_value(
+            self.prop(window, "_NET_WM_WINDOW_TYPE"))
+        type_details = self.config.knox.window_type_names(types)
         separator = "."
         if type_details is not None:
             types = list(type_details)
@@ -784,14 +1030,20 @@ class WindowFinder:
         self.match = self.MatchAll(self)
         self.toplevel = True
         self.focused = None
+        # how deep the window tree is searched when not only the toplevel
+        # windows are wanted
+        self.depth = None
+        # properties the matchers need, and their values while matching
+        self.properties = set()
+        self.props = None
 
         getters = {
-            'title': self.get_name,
-            'name': self.get_name,
-            'class': self.get_class,
-            'instance': self.get_instance,
-            'pid': self.get_pid,
-            'type': self.get_type,
+            'title': (self.get_name, Xatom.WM_NAME),
+            'name': (self.get_name, Xatom.WM_NAME),
+            'class': (self.get_class, Xatom.WM_CLASS),
+            'instance': (self.get_instance, Xatom.WM_CLASS),
+            'pid': (self.get_pid, "_NET_WM_PID"),
+            'type': (self.get_type, "_NET_WM_WINDOW_TYPE"),
         }
 
         if 'title' in section and 'name' in section:
@@ -810,10 +1062,14 @@ class WindowFinder:
                         "Unrecognized value in entry '%s' in section '%s'"
                         % (e, section.name))
             elif e in getters:
+                (getter, prop) = getters[e]
                 self.match.matchers.append(
-                    self.MatchAttr(section, e, getters[e]))
+                    self.MatchAttr(section, e, getter, prop))
+                self.properties.add(prop)
             elif e == 'focused':
                 self.focused = section.getboolean(e)
+            elif e == 'depth':
+                self.depth = section.getint(e)
             elif e == 'toplevel':
                 self.toplevel = section.getboolean(e)
                 # if section[e] in ['0', 'no', 'false']:
@@ -861,7 +1117,7 @@ class WindowFinder:
                 - set(self.config.knox.toplevel_windows(id_only=True) or []))
         else:
             wls = set()
-            for (window, _, _) in self.config.knox.window_tree():
+            for (window, _, _) in self.config.knox.window_tree(max_depth=self.depth):
                 wls.add(window.id)
             if self.toplevel is False:
                 wls -= set(self.config.knox.toplevel_windows(id_only=True) or [])
@@ -873,10 +1129,16 @@ class WindowFinder:
         if self.x_state and "Ignore" in self.x_state:
             wls -= self.x_state["Ignore"]
 
+        knox = self.config.knox
+        self.props = knox.get_props(
+            (win_id, name) for win_id in wls for name in self.properties)
         lst = []
-        for win_id in wls:
-            if self.match(self.config.knox.get_window(win_id)):
-                lst.append(win_id)
+        try:
+            for win_id in wls:
+                if self.match(knox.get_window(win_id)):
+                    lst.append(win_id)
+        finally:
+            self.props = None
         return lst
 
 
@@ -949,6 +1211,11 @@ class Config:
         self.waiters = dict()
         self.actions = dict()
         self.finders = dict()
+        # WorkerPool serving the consult children, if there is one
+        self.workers = None
+        # main_loop(command, argument, responder) runs the command on the
+        # main connection, set in the configuration of a worker
+        self.main_loop = None
         self.start = Start(self, self.config['start'])
         self.config_file = filename
         self.config_id = os.stat(filename).st_mtime
@@ -967,10 +1234,33 @@ class Config:
     def changed(self):
         return not (os.stat(self.config_file).st_mtime == self.config_id)
 
+    @property
+    def watched_paths(self):
+        """The configuration file and the files or directories listed in the
+        watch entry of the start section. A change in any of them should
+        cause a reload."""
+        paths = [ self.config_file ]
+        for p in self.config['start'].get('watch', '').split(';'):
+            p = p.strip()
+            if p:
+                paths.append(p)
+        return paths
+
     def reload(self):
         return Config(self.knox, self.config_file, self.event_loop,
                       extra_options=self.extra_options, add_env=False)
 
+    def for_connection(self, knox, event_loop):
+        """The same configuration for another X connection and event loop,
+        for a worker thread"""
+        return Config(knox, self.config_file, event_loop,
+                      extra_options=self.extra_options)
+
+    def consultant(self):
+        if self.workers is not None:
+            return self.workers.consultant()
+        return Consultant(self)
+
 
     def waiter(self, name):
         if name in self.waiters:
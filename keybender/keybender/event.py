@@ -1,76 +1,236 @@
-import math, functools
 import itertools
+import heapq
+import time
 from collections import namedtuple
 from collections.abc import Iterable
-import select
+import selectors
+import asyncio
+import inspect
+import collections
 from types import GeneratorType
 
 class Event:
+    """Handler record of the event loop. The same object is passed to the
+    handler on every call, so dispatching allocates nothing. Data other
+    than the fixed fields goes to a dict and is still reachable as an
+    attribute."""
     READABLE = 'readable'
     WRITEABLE = 'writeable'
     IDLE = 'idle'
+    TIMER = 'timer'
 
-    def __init__(self, name, **kwargs):
-        self.name = name
-        for (k, v) in kwargs.items():
-            setattr(self, k, v)
-        self._keys = set(kwargs.keys())
-
-    def handles(self, e):
-        return callable(getattr(self, 'handler', None)) and self == e
-
-    def __eq__(a, b):
-        """compare two events, but only the common subset if its attributes"""
-        if not isinstance(b, Event) or a.name != b.name:
-            return False
-        for k in set(a._keys) & set(b._keys):
-            if getattr(a, k) != getattr(b, k):
-                return False
-        return True
+    fields = ('handler', 'key', 'fd', 'timeout', 'periodic')
+    __slots__ = ('name', 'data') + fields
 
-    def __contains__(self, name):
-        return name in self._data
+    def __init__(self, name, handler=None, key=None, fd=None, timeout=None,
+                 periodic=False, **data):
+        self.name = name
+        self.handler = handler
+        self.key = key
+        self.fd = fd
+        self.timeout = timeout
+        self.periodic = periodic
+        self.data = data or None
 
-    def copy(self):
-        data = dict()
-        for k in self._keys:
-            data[k] = getattr(self, k)
-        return Event(self.name, **data)
+    def __getattr__(self, name):
+        # only called for what's not in the slots
+        data = object.__getattribute__(self, 'data')
+        if data is not None and name in data:
+            return data[name]
+        raise AttributeError(name)
 
-    def update(self, b):
-        for k in b._keys:
-            setattr(self, k, getattr(b, k))
-        return self
+    def keys(self):
+        """names of the attributes set on this event"""
+        keys = [ k for k in self.fields
+                 if getattr(self, k) is not None and getattr(self, k) is not False ]
+        if self.data:
+            keys.extend(self.data.keys())
+        return keys
 
+    def __contains__(self, name):
+        return name in self.keys()
 
 
 class EventLoop:
+    # events waited on through the selector, the rest is handled by the loop
+    selector_events = {
+        Event.READABLE: selectors.EVENT_READ,
+        Event.WRITEABLE: selectors.EVENT_WRITE,
+    }
+    selector_class = selectors.DefaultSelector
+
     def __init__(self):
         self.key = 1
         self.registry = dict()
+        # (event name, fd) -> handlers in registration order, the first
+        # one gets called
+        self.index = dict()
+        self.selector = self.selector_class() if self.selector_class else None
+        # heap of (deadline, sequence, handler), deadlines are on the
+        # monotonic clock
+        self.timers = []
+        self.timer_sequence = itertools.count()
+        # fd -> READABLE handlers, for the fds which have a pending() method
+        self.buffering = dict()
 
     def register(self, event_name, handler=None, **data):
         h = Event(event_name, handler=handler, key=self.key, **data)
         k = h.key
         self.registry[k] = h
         self.key += 1
+        handlers = self.index.setdefault((event_name, data.get('fd')), [])
+        handlers.append(h)
+        if event_name in self.selector_events:
+            self.watch(h, handlers)
+            if event_name == Event.READABLE and hasattr(h.fd, 'pending'):
+                self.buffering[h.fd] = handlers
+        elif event_name in (Event.TIMER, Event.IDLE):
+            self.schedule(h)
         return k
 
+    def call_later(self, timeout, handler, **data):
+        """Call handler once, timeout seconds from now"""
+        return self.register(Event.TIMER, handler, timeout=timeout, **data)
+
+    def call_every(self, timeout, handler, **data):
+        """Call handler every timeout seconds, until it's unregistered"""
+        return self.register(Event.TIMER, handler, timeout=timeout,
+                             periodic=True, **data)
+
+    def schedule(self, eh, deadline=None):
+        """IDLE handlers are periodic timers, their timeout is the period. Ones
+        without timeout are never called."""
+        if eh.timeout is None:
+            return
+        if deadline is None:
+            deadline = time.monotonic() + eh.timeout
+        heapq.heappush(self.timers, (deadline, next(self.timer_sequence), eh))
+
+    def next_timeout(self):
+        """Seconds until the earliest timer is due, None when there's none"""
+        while self.timers:
+            (deadline, _, eh) = self.timers[0]
+            if self.registry.get(eh.key) is not eh:
+                # unregistered meanwhile
+                heapq.heappop(self.timers)
+                continue
+            return max(deadline - time.monotonic(), 0)
+        return None
+
+    def run_timers(self):
+        """Call every handler which is due, yielding their results"""
+        now = time.monotonic()
+        while self.timers and self.timers[0][0] <= now:
+            (deadline, _, eh) = heapq.heappop(self.timers)
+            if self.registry.get(eh.key) is not eh:
+                continue
+            r = self.expire(eh, deadline, now)
+            if isinstance(r, GeneratorType):
+                yield from r
+            elif r is not None:
+                yield r
+
+    def expire(self, eh, deadline, now):
+        """Reschedule or drop the timer which was due at deadline, then call
+        its handler"""
+        if eh.name == Event.IDLE or eh.periodic:
+            deadline += eh.timeout
+            if deadline <= now:
+                # fell behind, don't try to catch up with a burst
+                deadline = now + eh.timeout
+            self.schedule(eh, deadline)
+        else:
+            self.unregister(eh.key)
+        if callable(eh.handler):
+            return eh.handler(eh, self)
+
+    def unschedule(self, eh):
+        # the heap entry is dropped once it gets to the top
+        pass
+
+    def watch(self, eh, handlers):
+        """Add the file descriptor of the handler to the selector. It stays
+        there until the last handler for it is unregistered. The selector
+        key data maps event names to the handler lists of the index."""
+        try:
+            if eh.fd.fileno() < 0:
+                return
+        except ValueError:
+            # closed file
+            return
+        try:
+            sk = self.selector.get_key(eh.fd)
+        except KeyError:
+            sk = None
+        if sk is None:
+            data = { eh.name: handlers }
+            try:
+                self.selector.register(
+                    eh.fd, self.selector_events[eh.name], data)
+            except KeyError:
+                # the same fd number is still registered for an object
+                # which has been closed without unregistering it
+                stale = self.selector.get_map()[eh.fd.fileno()]
+                self.selector.unregister(stale.fileobj)
+                self.selector.register(
+                    eh.fd, self.selector_events[eh.name], data)
+        else:
+            sk.data[eh.name] = handlers
+            events = sk.events | self.selector_events[eh.name]
+            if events != sk.events:
+                self.selector.modify(eh.fd, events, sk.data)
+
+    def unwatch(self, eh):
+        try:
+            sk = self.selector.get_key(eh.fd)
+        except (KeyError, ValueError):
+            return
+        if not sk.data.get(eh.name):
+            sk.data.pop(eh.name, None)
+        events = 0
+        for name in sk.data:
+            events |= self.selector_events[name]
+        try:
+            if not events:
+                self.selector.unregister(eh.fd)
+            elif events != sk.events:
+                self.selector.modify(eh.fd, events, sk.data)
+        except (OSError, ValueError):
+            # fd has been closed already, just forget about it
+            try:
+                self.selector.unregister(sk.fileobj)
+            except (KeyError, ValueError):
+                # the failed call dropped it already
+                pass
+
     def find_handler(self, k, **data):
+        """Find a handler by its key, or by event name and the data it was
+        registered with. The latter needs the fd, if it had one."""
         if k in self.registry:
             return self.registry[k]
-        elif data:
-            name = k
-            event = Event(name, **data)
-            for (k, eh) in list(self.registry.items()):
-                if eh == data:
-                    return self.registry[k]
+        for eh in self.index.get((k, data.get('fd')), ()):
+            for (name, value) in data.items():
+                if getattr(eh, name, value) != value:
+                    break
+            else:
+                return eh
         return None
 
     def unregister(self, k, **data):
         eh = self.find_handler(k, **data)
         if eh is not None:
             del self.registry[eh.key]
+            index_key = (eh.name, eh.fd)
+            handlers = self.index[index_key]
+            handlers.remove(eh)
+            if not handlers:
+                del self.index[index_key]
+                if eh.name == Event.READABLE:
+                    self.buffering.pop(eh.fd, None)
+            if eh.name in self.selector_events:
+                self.unwatch(eh)
+            elif eh.name in (Event.TIMER, Event.IDLE):
+                self.unschedule(eh)
 
     def __iter__(self):
         self.buffered_results = []
@@ -79,55 +239,195 @@ class EventLoop:
     def quit(self):
         self._quit = True
 
-    def handle(self, name, **data):
-        event = Event(name, **data)
-        for event_handler in self.registry.values():
-            if event_handler.handles(event):
-                eh = event.copy().update(event_handler)
+    def dispatch(self, handlers):
+        for eh in handlers:
+            if callable(eh.handler):
                 return (True, eh.handler(eh, self))
         return (False, None)
 
+    def handle(self, name, **data):
+        return self.dispatch(self.index.get((name, data.get('fd')), ()))
+
+    def buffered(self):
+        """Handler lists of the readable objects which have input buffered
+        on their side, so select wouldn't tell about it. Those objects have
+        a pending() method returning True, they're noted when registered."""
+        if not self.buffering:
+            return ()
+        return [ handlers for (fd, handlers) in self.buffering.items()
+                 if fd.pending() ]
+
+    def run_buffered(self):
+        for handlers in self.buffered():
+            (h, r) = self.dispatch(handlers)
+            if isinstance(r, GeneratorType):
+                yield from r
+            elif r is not None:
+                yield r
+
     def process(self):
         """Call this in a for loop for values returned from handlers.
         """
         self._quit = False
         while not self._quit:
-            idle_handlers = list()
-            readers = list()
-            writers = list()
-            for eh in self.registry.values():
-                if eh.name == eh.IDLE:
-                    idle_handlers.append(eh)
-                elif eh.name == eh.READABLE:
-                    readers.append(eh)
-                elif eh.name == eh.WRITEABLE:
-                    writers.append(eh)
-
-            timeout = functools.reduce(
-                math.gcd,
-                filter(None, map(lambda eh: eh.timeout, idle_handlers)), 0)
-            rl = list(filter(lambda fd: fd.fileno() > 0, map(lambda eh: eh.fd, readers)))
-            wl = list(filter(lambda fd: fd.fileno() > 0, map(lambda eh: eh.fd, writers)))
-
-            (r_rl, r_wl, _) = select.select(rl, wl, [], timeout or None)
-            handled = False
-            for fd in r_rl:
-                (h, r) = self.handle(Event.READABLE, fd=fd)
-                if isinstance(r, GeneratorType):
-                    yield from r
-                elif r is not None:
-                    yield r
-                handled = handled or h
-            for fd in r_wl:
-                (h, r) = self.handle(Event.WRITEABLE, fd=fd)
-                if isinstance(r, GeneratorType):
-                    yield from r
-                elif r is not None:
-                    yield r
-                handled = handled or h
-            if not handled:
-                (h, r) = self.handle(Event.IDLE)
-                if isinstance(r, GeneratorType):
-                    yield from r
-                elif r is not None:
-                    yield r
+            timeout = self.next_timeout()
+            if self.buffering and self.buffered():
+                timeout = 0
+            for (sk, events) in self.selector.select(timeout):
+                for (name, mask) in self.selector_events.items():
+                    if not events & mask:
+                        continue
+                    (h, r) = self.dispatch(sk.data.get(name, ()))
+                    if isinstance(r, GeneratorType):
+                        yield from r
+                    elif r is not None:
+                        yield r
+            yield from self.run_timers()
+            if self.buffering:
+                yield from self.run_buffered()
+
+
+class AsyncioEventLoop(EventLoop):
+    """The same API on top of an asyncio loop. File descriptors go to
+    add_reader/add_writer and timers to call_at, handlers are called from
+    the asyncio callbacks. Their results, or what their generators yield,
+    are queued for process(), which
+    runs the asyncio loop until there is something to yield, or for
+    aprocess() when the asyncio loop is already running in the process.
+    Coroutines returned by handlers are scheduled as tasks."""
+    selector_class = None
+
+    def __init__(self, loop=None):
+        super().__init__()
+        self.loop = loop if loop is not None else asyncio.new_event_loop()
+        self.results = collections.deque()
+        self.wakeup = None
+        self.fds = dict()
+        self.timer_handles = dict()
+        self.tasks = set()
+
+    def watch(self, eh, handlers):
+        try:
+            fd = eh.fd.fileno()
+        except ValueError:
+            # closed file
+            return
+        if fd < 0:
+            return
+        # remember the number, the object may be closed by the time it's
+        # unregistered
+        self.fds[eh.fd] = fd
+        if eh.name == Event.READABLE:
+            self.loop.add_reader(fd, self.ready, handlers)
+        else:
+            self.loop.add_writer(fd, self.ready, handlers)
+
+    def unwatch(self, eh):
+        if (eh.name, eh.fd) in self.index:
+            # still has handlers
+            return
+        fd = self.fds.get(eh.fd)
+        if fd is None:
+            return
+        if eh.name == Event.READABLE:
+            self.loop.remove_reader(fd)
+        else:
+            self.loop.remove_writer(fd)
+        if ((Event.READABLE, eh.fd) not in self.index
+            and (Event.WRITEABLE, eh.fd) not in self.index):
+            del self.fds[eh.fd]
+
+    def schedule(self, eh, deadline=None):
+        if eh.timeout is None:
+            return
+        if deadline is None:
+            deadline = self.loop.time() + eh.timeout
+        self.timer_handles[eh.key] = self.loop.call_at(
+            deadline, self.timer_ready, eh, deadline)
+
+    def unschedule(self, eh):
+        handle = self.timer_handles.pop(eh.key, None)
+        if handle is not None:
+            handle.cancel()
+
+    def next_timeout(self):
+        return None
+
+    def run_timers(self):
+        return iter(())
+
+    def ready(self, handlers):
+        (h, r) = self.dispatch(handlers)
+        self.collect(r)
+        self.check_buffered()
+
+    def timer_ready(self, eh, deadline):
+        del self.timer_handles[eh.key]
+        self.collect(self.expire(eh, deadline, self.loop.time()))
+        self.check_buffered()
+
+    def check_buffered(self):
+        for handlers in self.buffered():
+            self.loop.call_soon(self.ready, handlers)
+
+    def collect(self, r):
+        if r is None:
+            return
+        if isinstance(r, GeneratorType):
+            # run it while the fd is ready, the loop may call the same
+            # handler again before process() gets to it
+            self.results.extend(r)
+        elif inspect.iscoroutine(r):
+            task = self.loop.create_task(r)
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            return
+        else:
+            self.results.append(r)
+        self.wake()
+
+    def wake(self):
+        if self.wakeup is not None and not self.wakeup.done():
+            self.wakeup.set_result(None)
+
+    def quit(self):
+        super().quit()
+        self.wake()
+
+    def drain(self):
+        while self.results and not self._quit:
+            yield self.results.popleft()
+
+    def process(self):
+        """Blocking shim for the callers of EventLoop.process(), it can't be
+        used from inside a running asyncio loop."""
+        self._quit = False
+        while not self._quit:
+            if not self.results:
+                # input buffered while the results were handled
+                self.check_buffered()
+                self.wakeup = self.loop.create_future()
+                self.loop.run_until_complete(self.wakeup)
+                self.wakeup = None
+            yield from self.drain()
+
+    async def aprocess(self):
+        """async for loop variant of process()"""
+        self._quit = False
+        while not self._quit:
+            if not self.results:
+                self.check_buffered()
+                self.wakeup = self.loop.create_future()
+                await self.wakeup
+                self.wakeup = None
+            while self.results and not self._quit:
+                yield self.results.popleft()
+
+    def close(self):
+        """Unregister everything, cancel running tasks. The asyncio loop is
+        left to its owner."""
+        for k in list(self.registry.keys()):
+            self.unregister(k)
+        for task in list(self.tasks):
+            task.cancel()
+        self.quit()
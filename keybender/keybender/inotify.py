@@ -0,0 +1,232 @@
+import ctypes, ctypes.util
+import os
+import struct
+from keybender.event import Event
+
+# from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+
+class Inotify:
+    """Thin ctypes wrapper around the inotify system calls"""
+    event_header = struct.Struct("iIII")
+    _libc = None
+
+    @classmethod
+    def libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            # raises AttributeError if it's not there, not on Linux
+            libc.inotify_init1.argtypes = [ ctypes.c_int ]
+            libc.inotify_add_watch.argtypes = [
+                ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32 ]
+            libc.inotify_rm_watch.argtypes = [ ctypes.c_int, ctypes.c_int ]
+            cls._libc = libc
+        return cls._libc
+
+    @classmethod
+    def available(cls):
+        try:
+            cls.libc()
+            return True
+        except (OSError, AttributeError, TypeError):
+            return False
+
+    def __init__(self):
+        self.fd = self.libc().inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            self.raise_errno()
+
+    def raise_errno(self, path=None):
+        e = ctypes.get_errno()
+        raise OSError(e, os.strerror(e), path)
+
+    def fileno(self):
+        return self.fd
+
+    def add_watch(self, path, mask):
+        wd = self.libc().inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            self.raise_errno(path)
+        return wd
+
+    def rm_watch(self, wd):
+        # fails when the watch is already gone with its file, that's fine
+        self.libc().inotify_rm_watch(self.fd, wd)
+
+    def read(self):
+        """Returns list of (wd, mask, cookie, name) for the queued events"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            i = 0
+            while i < len(data):
+                (wd, mask, cookie, n) = self.event_header.unpack_from(data, i)
+                i += self.event_header.size
+                name = data[i:i+n].rstrip(b'\0').decode(errors='replace')
+                i += n
+                events.append((wd, mask, cookie, name))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher:
+    """Calls callback when any of the watched files or directories changes.
+    Parent directories are watched instead of the files, so a file replaced
+    by renaming a new one on it (what editors do on save) is noticed as
+    well. Changes are collected for delay seconds before calling back, so a
+    save producing several events causes a single call. Directories which
+    can't be watched, like ones removed or not created yet, are polled
+    every poll_interval seconds until they can."""
+    dir_mask = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM
+                | IN_CREATE | IN_DELETE | IN_ATTRIB)
+    self_mask = IN_DELETE_SELF | IN_MOVE_SELF
+
+    available = Inotify.available
+
+    def __init__(self, event_loop, callback, paths=(), delay=0.3,
+                 poll_interval=4):
+        self.event_loop = event_loop
+        self.callback = callback
+        self.delay = delay
+        self.poll_interval = poll_interval
+        self.inotify = Inotify()
+        # wd -> (directory, set of names in it or None for all of them)
+        self.watches = dict()
+        self.paths = ()
+        # directories add_watch failed on
+        self.unwatched = set()
+        self.timer_key = None
+        self.poll_key = None
+        self.stamps = None
+        self.watch(paths)
+        self.handler_key = self.event_loop.register(
+            Event.READABLE, self.inotify_event, fd=self.inotify)
+
+    def fileno(self):
+        return self.inotify.fileno()
+
+    def watch(self, paths):
+        """Watch these paths instead of the ones before"""
+        self.paths = tuple(paths)
+        wanted = dict()
+        for path in paths:
+            path = os.path.abspath(os.path.expanduser(path))
+            # a symlink is edited where it points to
+            for p in dict.fromkeys((path, os.path.realpath(path))):
+                if os.path.isdir(p):
+                    wanted[p] = None
+                else:
+                    (directory, name) = os.path.split(p)
+                    names = wanted.setdefault(directory, set())
+                    if names is not None:
+                        names.add(name)
+
+        for (wd, (directory, _)) in list(self.watches.items()):
+            if directory not in wanted:
+                self.inotify.rm_watch(wd)
+                del self.watches[wd]
+        unwatched = set()
+        for (directory, names) in wanted.items():
+            try:
+                wd = self.inotify.add_watch(
+                    directory, self.dir_mask | self.self_mask | IN_ONLYDIR)
+            except OSError as e:
+                if directory not in self.unwatched:
+                    print("Cannot watch %r, polling it: %s" % (directory, e))
+                unwatched.add(directory)
+                continue
+            if directory in self.unwatched:
+                print("Watching %r again" % directory)
+            # adding an existing watch returns the same descriptor
+            self.watches[wd] = (directory, names)
+        self.unwatched = unwatched
+
+        if self.unwatched and self.poll_key is None:
+            self.stamps = self.stat()
+            self.poll_key = self.event_loop.call_every(self.poll_interval,
+                                                       self.poll)
+        elif not self.unwatched and self.poll_key is not None:
+            self.event_loop.unregister(self.poll_key)
+            self.poll_key = None
+
+    def stat(self):
+        stamps = []
+        for path in self.paths:
+            try:
+                st = os.stat(os.path.expanduser(path))
+                stamps.append((st.st_ino, st.st_mtime))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def poll(self, event, event_loop):
+        stamps = self.stat()
+        changed = stamps != self.stamps
+        self.stamps = stamps
+        # stops polling if all of them can be watched again
+        self.watch(self.paths)
+        if changed:
+            return self.callback()
+
+    def relevant(self, wd, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            # lost events, can't tell
+            return True
+        if wd not in self.watches:
+            return False
+        (directory, names) = self.watches[wd]
+        if mask & (self.self_mask | IN_IGNORED):
+            # directory itself went away
+            del self.watches[wd]
+            return True
+        return names is None or name in names
+
+    def inotify_event(self, event, event_loop):
+        changed = False
+        for (wd, mask, _, name) in self.inotify.read():
+            if self.relevant(wd, mask, name):
+                changed = True
+        if not changed:
+            return
+        if self.timer_key is not None:
+            event_loop.unregister(self.timer_key)
+        self.timer_key = event_loop.call_later(self.delay, self.settled)
+
+    def settled(self, event, event_loop):
+        self.timer_key = None
+        # put back the watches of directories which went away, or poll them
+        self.watch(self.paths)
+        return self.callback()
+
+    def close(self):
+        if self.timer_key is not None:
+            self.event_loop.unregister(self.timer_key)
+            self.timer_key = None
+        if self.poll_key is not None:
+            self.event_loop.unregister(self.poll_key)
+            self.poll_key = None
+        self.event_loop.unregister(self.handler_key)
+        self.inotify.close()
@@ -0,0 +1,1265 @@
+"""Generated by mkkeysyms.py from Xlib.keysymdef.miscellany, latin1, xkb, xf86, do not edit"""
+
+names = {
+    'XK_BackSpace': 0xff08,
+    'XK_Tab': 0xff09,
+    'XK_Linefeed': 0xff0a,
+    'XK_Clear': 0xff0b,
+    'XK_Return': 0xff0d,
+    'XK_Pause': 0xff13,
+    'XK_Scroll_Lock': 0xff14,
+    'XK_Sys_Req': 0xff15,
+    'XK_Escape': 0xff1b,
+    'XK_Delete': 0xffff,
+    'XK_Multi_key': 0xff20,
+    'XK_SingleCandidate': 0xff3c,
+    'XK_MultipleCandidate': 0xff3d,
+    'XK_PreviousCandidate': 0xff3e,
+    'XK_Kanji': 0xff21,
+    'XK_Muhenkan': 0xff22,
+    'XK_Henkan_Mode': 0xff23,
+    'XK_Henkan': 0xff23,
+    'XK_Romaji': 0xff24,
+    'XK_Hiragana': 0xff25,
+    'XK_Katakana': 0xff26,
+    'XK_Hiragana_Katakana': 0xff27,
+    'XK_Zenkaku': 0xff28,
+    'XK_Hankaku': 0xff29,
+    'XK_Zenkaku_Hankaku': 0xff2a,
+    'XK_Touroku': 0xff2b,
+    'XK_Massyo': 0xff2c,
+    'XK_Kana_Lock': 0xff2d,
+    'XK_Kana_Shift': 0xff2e,
+    'XK_Eisu_Shift': 0xff2f,
+    'XK_Eisu_toggle': 0xff30,
+    'XK_Zen_Koho': 0xff3d,
+    'XK_Mae_Koho': 0xff3e,
+    'XK_Home': 0xff50,
+    'XK_Left': 0xff51,
+    'XK_Up': 0xff52,
+    'XK_Right': 0xff53,
+    'XK_Down': 0xff54,
+    'XK_Prior': 0xff55,
+    'XK_Page_Up': 0xff55,
+    'XK_Next': 0xff56,
+    'XK_Page_Down': 0xff56,
+    'XK_End': 0xff57,
+    'XK_Begin': 0xff58,
+    'XK_Select': 0xff60,
+    'XK_Print': 0xff61,
+    'XK_Execute': 0xff62,
+    'XK_Insert': 0xff63,
+    'XK_Undo': 0xff65,
+    'XK_Redo': 0xff66,
+    'XK_Menu': 0xff67,
+    'XK_Find': 0xff68,
+    'XK_Cancel': 0xff69,
+    'XK_Help': 0xff6a,
+    'XK_Break': 0xff6b,
+    'XK_Mode_switch': 0xff7e,
+    'XK_script_switch': 0xff7e,
+    'XK_Num_Lock': 0xff7f,
+    'XK_KP_Space': 0xff80,
+    'XK_KP_Tab': 0xff89,
+    'XK_KP_Enter': 0xff8d,
+    'XK_KP_F1': 0xff91,
+    'XK_KP_F2': 0xff92,
+    'XK_KP_F3': 0xff93,
+    'XK_KP_F4': 0xff94,
+    'XK_KP_Home': 0xff95,
+    'XK_KP_Left': 0xff96,
+    'XK_KP_Up': 0xff97,
+    'XK_KP_Right': 0xff98,
+    'XK_KP_Down': 0xff99,
+    'XK_KP_Prior': 0xff9a,
+    'XK_KP_Page_Up': 0xff9a,
+    'XK_KP_Next': 0xff9b,
+    'XK_KP_Page_Down': 0xff9b,
+    'XK_KP_End': 0xff9c,
+    'XK_KP_Begin': 0xff9d,
+    'XK_KP_Insert': 0xff9e,
+    'XK_KP_Delete': 0xff9f,
+    'XK_KP_Equal': 0xffbd,
+    'XK_KP_Multiply': 0xffaa,
+    'XK_KP_Add': 0xffab,
+    'XK_KP_Separator': 0xffac,
+    'XK_KP_Subtract': 0xffad,
+    'XK_KP_Decimal': 0xffae,
+    'XK_KP_Divide': 0xffaf,
+    'XK_KP_0': 0xffb0,
+    'XK_KP_1': 0xffb1,
+    'XK_KP_2': 0xffb2,
+    'XK_KP_3': 0xffb3,
+    'XK_KP_4': 0xffb4,
+    'XK_KP_5': 0xffb5,
+    'XK_KP_6': 0xffb6,
+    'XK_KP_7': 0xffb7,
+    'XK_KP_8': 0xffb8,
+    'XK_KP_9': 0xffb9,
+    'XK_F1': 0xffbe,
+    'XK_F2': 0xffbf,
+    'XK_F3': 0xffc0,
+    'XK_F4': 0xffc1,
+    'XK_F5': 0xffc2,
+    'XK_F6': 0xffc3,
+    'XK_F7': 0xffc4,
+    'XK_F8': 0xffc5,
+    'XK_F9': 0xffc6,
+    'XK_F10': 0xffc7,
+    'XK_F11': 0xffc8,
+    'XK_L1': 0xffc8,
+    'XK_F12': 0xffc9,
+    'XK_L2': 0xffc9,
+    'XK_F13': 0xffca,
+    'XK_L3': 0xffca,
+    'XK_F14': 0xffcb,
+    'XK_L4': 0xffcb,
+    'XK_F15': 0xffcc,
+    'XK_L5': 0xffcc,
+    'XK_F16': 0xffcd,
+    'XK_L6': 0xffcd,
+    'XK_F17': 0xffce,
+    'XK_L7': 0xffce,
+    'XK_F18': 0xffcf,
+    'XK_L8': 0xffcf,
+    'XK_F19': 0xffd0,
+    'XK_L9': 0xffd0,
+    'XK_F20': 0xffd1,
+    'XK_L10': 0xffd1,
+    'XK_F21': 0xffd2,
+    'XK_R1': 0xffd2,
+    'XK_F22': 0xffd3,
+    'XK_R2': 0xffd3,
+    'XK_F23': 0xffd4,
+    'XK_R3': 0xffd4,
+    'XK_F24': 0xffd5,
+    'XK_R4': 0xffd5,
+    'XK_F25': 0xffd6,
+    'XK_R5': 0xffd6,
+    'XK_F26': 0xffd7,
+    'XK_R6': 0xffd7,
+    'XK_F27': 0xffd8,
+    'XK_R7': 0xffd8,
+    'XK_F28': 0xffd9,
+    'XK_R8': 0xffd9,
+    'XK_F29': 0xffda,
+    'XK_R9': 0xffda,
+    'XK_F30': 0xffdb,
+    'XK_R10': 0xffdb,
+    'XK_F31': 0xffdc,
+    'XK_R11': 0xffdc,
+    'XK_F32': 0xffdd,
+    'XK_R12': 0xffdd,
+    'XK_F33': 0xffde,
+    'XK_R13': 0xffde,
+    'XK_F34': 0xffdf,
+    'XK_R14': 0xffdf,
+    'XK_F35': 0xffe0,
+    'XK_R15': 0xffe0,
+    'XK_Shift_L': 0xffe1,
+    'XK_Shift_R': 0xffe2,
+    'XK_Control_L': 0xffe3,
+    'XK_Control_R': 0xffe4,
+    'XK_Caps_Lock': 0xffe5,
+    'XK_Shift_Lock': 0xffe6,
+    'XK_Meta_L': 0xffe7,
+    'XK_Meta_R': 0xffe8,
+    'XK_Alt_L': 0xffe9,
+    'XK_Alt_R': 0xffea,
+    'XK_Super_L': 0xffeb,
+    'XK_Super_R': 0xffec,
+    'XK_Hyper_L': 0xffed,
+    'XK_Hyper_R': 0xffee,
+    'XK_space': 0x20,
+    'XK_exclam': 0x21,
+    'XK_quotedbl': 0x22,
+    'XK_numbersign': 0x23,
+    'XK_dollar': 0x24,
+    'XK_percent': 0x25,
+    'XK_ampersand': 0x26,
+    'XK_apostrophe': 0x27,
+    'XK_quoteright': 0x27,
+    'XK_parenleft': 0x28,
+    'XK_parenright': 0x29,
+    'XK_asterisk': 0x2a,
+    'XK_plus': 0x2b,
+    'XK_comma': 0x2c,
+    'XK_minus': 0x2d,
+    'XK_period': 0x2e,
+    'XK_slash': 0x2f,
+    'XK_0': 0x30,
+    'XK_1': 0x31,
+    'XK_2': 0x32,
+    'XK_3': 0x33,
+    'XK_4': 0x34,
+    'XK_5': 0x35,
+    'XK_6': 0x36,
+    'XK_7': 0x37,
+    'XK_8': 0x38,
+    'XK_9': 0x39,
+    'XK_colon': 0x3a,
+    'XK_semicolon': 0x3b,
+    'XK_less': 0x3c,
+    'XK_equal': 0x3d,
+    'XK_greater': 0x3e,
+    'XK_question': 0x3f,
+    'XK_at': 0x40,
+    'XK_A': 0x41,
+    'XK_B': 0x42,
+    'XK_C': 0x43,
+    'XK_D': 0x44,
+    'XK_E': 0x45,
+    'XK_F': 0x46,
+    'XK_G': 0x47,
+    'XK_H': 0x48,
+    'XK_I': 0x49,
+    'XK_J': 0x4a,
+    'XK_K': 0x4b,
+    'XK_L': 0x4c,
+    'XK_M': 0x4d,
+    'XK_N': 0x4e,
+    'XK_O': 0x4f,
+    'XK_P': 0x50,
+    'XK_Q': 0x51,
+    'XK_R': 0x52,
+    'XK_S': 0x53,
+    'XK_T': 0x54,
+    'XK_U': 0x55,
+    'XK_V': 0x56,
+    'XK_W': 0x57,
+    'XK_X': 0x58,
+    'XK_Y': 0x59,
+    'XK_Z': 0x5a,
+    'XK_bracketleft': 0x5b,
+    'XK_backslash': 0x5c,
+    'XK_bracketright': 0x5d,
+    'XK_asciicircum': 0x5e,
+    'XK_underscore': 0x5f,
+    'XK_grave': 0x60,
+    'XK_quoteleft': 0x60,
+    'XK_a': 0x61,
+    'XK_b': 0x62,
+    'XK_c': 0x63,
+    'XK_d': 0x64,
+    'XK_e': 0x65,
+    'XK_f': 0x66,
+    'XK_g': 0x67,
+    'XK_h': 0x68,
+    'XK_i': 0x69,
+    'XK_j': 0x6a,
+    'XK_k': 0x6b,
+    'XK_l': 0x6c,
+    'XK_m': 0x6d,
+    'XK_n': 0x6e,
+    'XK_o': 0x6f,
+    'XK_p': 0x70,
+    'XK_q': 0x71,
+    'XK_r': 0x72,
+    'XK_s': 0x73,
+    'XK_t': 0x74,
+    'XK_u': 0x75,
+    'XK_v': 0x76,
+    'XK_w': 0x77,
+    'XK_x': 0x78,
+    'XK_y': 0x79,
+    'XK_z': 0x7a,
+    'XK_braceleft': 0x7b,
+    'XK_bar': 0x7c,
+    'XK_braceright': 0x7d,
+    'XK_asciitilde': 0x7e,
+    'XK_nobreakspace': 0xa0,
+    'XK_exclamdown': 0xa1,
+    'XK_cent': 0xa2,
+    'XK_sterling': 0xa3,
+    'XK_currency': 0xa4,
+    'XK_yen': 0xa5,
+    'XK_brokenbar': 0xa6,
+    'XK_section': 0xa7,
+    'XK_diaeresis': 0xa8,
+    'XK_copyright': 0xa9,
+    'XK_ordfeminine': 0xaa,
+    'XK_guillemotleft': 0xab,
+    'XK_notsign': 0xac,
+    'XK_hyphen': 0xad,
+    'XK_registered': 0xae,
+    'XK_macron': 0xaf,
+    'XK_degree': 0xb0,
+    'XK_plusminus': 0xb1,
+    'XK_twosuperior': 0xb2,
+    'XK_threesuperior': 0xb3,
+    'XK_acute': 0xb4,
+    'XK_mu': 0xb5,
+    'XK_paragraph': 0xb6,
+    'XK_periodcentered': 0xb7,
+    'XK_cedilla': 0xb8,
+    'XK_onesuperior': 0xb9,
+    'XK_masculine': 0xba,
+    'XK_guillemotright': 0xbb,
+    'XK_onequarter': 0xbc,
+    'XK_onehalf': 0xbd,
+    'XK_threequarters': 0xbe,
+    'XK_questiondown': 0xbf,
+    'XK_Agrave': 0xc0,
+    'XK_Aacute': 0xc1,
+    'XK_Acircumflex': 0xc2,
+    'XK_Atilde': 0xc3,
+    'XK_Adiaeresis': 0xc4,
+    'XK_Aring': 0xc5,
+    'XK_AE': 0xc6,
+    'XK_Ccedilla': 0xc7,
+    'XK_Egrave': 0xc8,
+    'XK_Eacute': 0xc9,
+    'XK_Ecircumflex': 0xca,
+    'XK_Ediaeresis': 0xcb,
+    'XK_Igrave': 0xcc,
+    'XK_Iacute': 0xcd,
+    'XK_Icircumflex': 0xce,
+    'XK_Idiaeresis': 0xcf,
+    'XK_ETH': 0xd0,
+    'XK_Eth': 0xd0,
+    'XK_Ntilde': 0xd1,
+    'XK_Ograve': 0xd2,
+    'XK_Oacute': 0xd3,
+    'XK_Ocircumflex': 0xd4,
+    'XK_Otilde': 0xd5,
+    'XK_Odiaeresis': 0xd6,
+    'XK_multiply': 0xd7,
+    'XK_Ooblique': 0xd8,
+    'XK_Ugrave': 0xd9,
+    'XK_Uacute': 0xda,
+    'XK_Ucircumflex': 0xdb,
+    'XK_Udiaeresis': 0xdc,
+    'XK_Yacute': 0xdd,
+    'XK_THORN': 0xde,
+    'XK_Thorn': 0xde,
+    'XK_ssharp': 0xdf,
+    'XK_agrave': 0xe0,
+    'XK_aacute': 0xe1,
+    'XK_acircumflex': 0xe2,
+    'XK_atilde': 0xe3,
+    'XK_adiaeresis': 0xe4,
+    'XK_aring': 0xe5,
+    'XK_ae': 0xe6,
+    'XK_ccedilla': 0xe7,
+    'XK_egrave': 0xe8,
+    'XK_eacute': 0xe9,
+    'XK_ecircumflex': 0xea,
+    'XK_ediaeresis': 0xeb,
+    'XK_igrave': 0xec,
+    'XK_iacute': 0xed,
+    'XK_icircumflex': 0xee,
+    'XK_idiaeresis': 0xef,
+    'XK_eth': 0xf0,
+    'XK_ntilde': 0xf1,
+    'XK_ograve': 0xf2,
+    'XK_oacute': 0xf3,
+    'XK_ocircumflex': 0xf4,
+    'XK_otilde': 0xf5,
+    'XK_odiaeresis': 0xf6,
+    'XK_division': 0xf7,
+    'XK_oslash': 0xf8,
+    'XK_ugrave': 0xf9,
+    'XK_uacute': 0xfa,
+    'XK_ucircumflex': 0xfb,
+    'XK_udiaeresis': 0xfc,
+    'XK_yacute': 0xfd,
+    'XK_thorn': 0xfe,
+    'XK_ydiaeresis': 0xff,
+    'XK_ISO_Lock': 0xfe01,
+    'XK_ISO_Level2_Latch': 0xfe02,
+    'XK_ISO_Level3_Shift': 0xfe03,
+    'XK_ISO_Level3_Latch': 0xfe04,
+    'XK_ISO_Level3_Lock': 0xfe05,
+    'XK_ISO_Group_Shift': 0xff7e,
+    'XK_ISO_Group_Latch': 0xfe06,
+    'XK_ISO_Group_Lock': 0xfe07,
+    'XK_ISO_Next_Group': 0xfe08,
+    'XK_ISO_Next_Group_Lock': 0xfe09,
+    'XK_ISO_Prev_Group': 0xfe0a,
+    'XK_ISO_Prev_Group_Lock': 0xfe0b,
+    'XK_ISO_First_Group': 0xfe0c,
+    'XK_ISO_First_Group_Lock': 0xfe0d,
+    'XK_ISO_Last_Group': 0xfe0e,
+    'XK_ISO_Last_Group_Lock': 0xfe0f,
+    'XK_ISO_Left_Tab': 0xfe20,
+    'XK_ISO_Move_Line_Up': 0xfe21,
+    'XK_ISO_Move_Line_Down': 0xfe22,
+    'XK_ISO_Partial_Line_Up': 0xfe23,
+    'XK_ISO_Partial_Line_Down': 0xfe24,
+    'XK_ISO_Partial_Space_Left': 0xfe25,
+    'XK_ISO_Partial_Space_Right': 0xfe26,
+    'XK_ISO_Set_Margin_Left': 0xfe27,
+    'XK_ISO_Set_Margin_Right': 0xfe28,
+    'XK_ISO_Release_Margin_Left': 0xfe29,
+    'XK_ISO_Release_Margin_Right': 0xfe2a,
+    'XK_ISO_Release_Both_Margins': 0xfe2b,
+    'XK_ISO_Fast_Cursor_Left': 0xfe2c,
+    'XK_ISO_Fast_Cursor_Right': 0xfe2d,
+    'XK_ISO_Fast_Cursor_Up': 0xfe2e,
+    'XK_ISO_Fast_Cursor_Down': 0xfe2f,
+    'XK_ISO_Continuous_Underline': 0xfe30,
+    'XK_ISO_Discontinuous_Underline': 0xfe31,
+    'XK_ISO_Emphasize': 0xfe32,
+    'XK_ISO_Center_Object': 0xfe33,
+    'XK_ISO_Enter': 0xfe34,
+    'XK_dead_grave': 0xfe50,
+    'XK_dead_acute': 0xfe51,
+    'XK_dead_circumflex': 0xfe52,
+    'XK_dead_tilde': 0xfe53,
+    'XK_dead_macron': 0xfe54,
+    'XK_dead_breve': 0xfe55,
+    'XK_dead_abovedot': 0xfe56,
+    'XK_dead_diaeresis': 0xfe57,
+    'XK_dead_abovering': 0xfe58,
+    'XK_dead_doubleacute': 0xfe59,
+    'XK_dead_caron': 0xfe5a,
+    'XK_dead_cedilla': 0xfe5b,
+    'XK_dead_ogonek': 0xfe5c,
+    'XK_dead_iota': 0xfe5d,
+    'XK_dead_voiced_sound': 0xfe5e,
+    'XK_dead_semivoiced_sound': 0xfe5f,
+    'XK_dead_belowdot': 0xfe60,
+    'XK_First_Virtual_Screen': 0xfed0,
+    'XK_Prev_Virtual_Screen': 0xfed1,
+    'XK_Next_Virtual_Screen': 0xfed2,
+    'XK_Last_Virtual_Screen': 0xfed4,
+    'XK_Terminate_Server': 0xfed5,
+    'XK_AccessX_Enable': 0xfe70,
+    'XK_AccessX_Feedback_Enable': 0xfe71,
+    'XK_RepeatKeys_Enable': 0xfe72,
+    'XK_SlowKeys_Enable': 0xfe73,
+    'XK_BounceKeys_Enable': 0xfe74,
+    'XK_StickyKeys_Enable': 0xfe75,
+    'XK_MouseKeys_Enable': 0xfe76,
+    'XK_MouseKeys_Accel_Enable': 0xfe77,
+    'XK_Overlay1_Enable': 0xfe78,
+    'XK_Overlay2_Enable': 0xfe79,
+    'XK_AudibleBell_Enable': 0xfe7a,
+    'XK_Pointer_Left': 0xfee0,
+    'XK_Pointer_Right': 0xfee1,
+    'XK_Pointer_Up': 0xfee2,
+    'XK_Pointer_Down': 0xfee3,
+    'XK_Pointer_UpLeft': 0xfee4,
+    'XK_Pointer_UpRight': 0xfee5,
+    'XK_Pointer_DownLeft': 0xfee6,
+    'XK_Pointer_DownRight': 0xfee7,
+    'XK_Pointer_Button_Dflt': 0xfee8,
+    'XK_Pointer_Button1': 0xfee9,
+    'XK_Pointer_Button2': 0xfeea,
+    'XK_Pointer_Button3': 0xfeeb,
+    'XK_Pointer_Button4': 0xfeec,
+    'XK_Pointer_Button5': 0xfeed,
+    'XK_Pointer_DblClick_Dflt': 0xfeee,
+    'XK_Pointer_DblClick1': 0xfeef,
+    'XK_Pointer_DblClick2': 0xfef0,
+    'XK_Pointer_DblClick3': 0xfef1,
+    'XK_Pointer_DblClick4': 0xfef2,
+    'XK_Pointer_DblClick5': 0xfef3,
+    'XK_Pointer_Drag_Dflt': 0xfef4,
+    'XK_Pointer_Drag1': 0xfef5,
+    'XK_Pointer_Drag2': 0xfef6,
+    'XK_Pointer_Drag3': 0xfef7,
+    'XK_Pointer_Drag4': 0xfef8,
+    'XK_Pointer_Drag5': 0xfefd,
+    'XK_Pointer_EnableKeys': 0xfef9,
+    'XK_Pointer_Accelerate': 0xfefa,
+    'XK_Pointer_DfltBtnNext': 0xfefb,
+    'XK_Pointer_DfltBtnPrev': 0xfefc,
+    'XK_XF86_ModeLock': 0x1008ff01,
+    'XK_XF86_MonBrightnessUp': 0x1008ff02,
+    'XK_XF86_MonBrightnessDown': 0x1008ff03,
+    'XK_XF86_KbdLightOnOff': 0x1008ff04,
+    'XK_XF86_KbdBrightnessUp': 0x1008ff05,
+    'XK_XF86_KbdBrightnessDown': 0x1008ff06,
+    'XK_XF86_MonBrightnessCycle': 0x1008ff07,
+    'XK_XF86_Standby': 0x1008ff10,
+    'XK_XF86_AudioLowerVolume': 0x1008ff11,
+    'XK_XF86_AudioMute': 0x1008ff12,
+    'XK_XF86_AudioRaiseVolume': 0x1008ff13,
+    'XK_XF86_AudioPlay': 0x1008ff14,
+    'XK_XF86_AudioStop': 0x1008ff15,
+    'XK_XF86_AudioPrev': 0x1008ff16,
+    'XK_XF86_AudioNext': 0x1008ff17,
+    'XK_XF86_HomePage': 0x1008ff18,
+    'XK_XF86_Mail': 0x1008ff19,
+    'XK_XF86_Start': 0x1008ff1a,
+    'XK_XF86_Search': 0x1008ff1b,
+    'XK_XF86_AudioRecord': 0x1008ff1c,
+    'XK_XF86_Calculator': 0x1008ff1d,
+    'XK_XF86_Memo': 0x1008ff1e,
+    'XK_XF86_ToDoList': 0x1008ff1f,
+    'XK_XF86_Calendar': 0x1008ff20,
+    'XK_XF86_PowerDown': 0x1008ff21,
+    'XK_XF86_ContrastAdjust': 0x1008ff22,
+    'XK_XF86_RockerUp': 0x1008ff23,
+    'XK_XF86_RockerDown': 0x1008ff24,
+    'XK_XF86_RockerEnter': 0x1008ff25,
+    'XK_XF86_Back': 0x1008ff26,
+    'XK_XF86_Forward': 0x1008ff27,
+    'XK_XF86_Stop': 0x1008ff28,
+    'XK_XF86_Refresh': 0x1008ff29,
+    'XK_XF86_PowerOff': 0x1008ff2a,
+    'XK_XF86_WakeUp': 0x1008ff2b,
+    'XK_XF86_Eject': 0x1008ff2c,
+    'XK_XF86_ScreenSaver': 0x1008ff2d,
+    'XK_XF86_WWW': 0x1008ff2e,
+    'XK_XF86_Sleep': 0x1008ff2f,
+    'XK_XF86_Favorites': 0x1008ff30,
+    'XK_XF86_AudioPause': 0x1008ff31,
+    'XK_XF86_AudioMedia': 0x1008ff32,
+    'XK_XF86_MyComputer': 0x1008ff33,
+    'XK_XF86_VendorHome': 0x1008ff34,
+    'XK_XF86_LightBulb': 0x1008ff35,
+    'XK_XF86_Shop': 0x1008ff36,
+    'XK_XF86_History': 0x1008ff37,
+    'XK_XF86_OpenURL': 0x1008ff38,
+    'XK_XF86_AddFavorite': 0x1008ff39,
+    'XK_XF86_HotLinks': 0x1008ff3a,
+    'XK_XF86_BrightnessAdjust': 0x1008ff3b,
+    'XK_XF86_Finance': 0x1008ff3c,
+    'XK_XF86_Community': 0x1008ff3d,
+    'XK_XF86_AudioRewind': 0x1008ff3e,
+    'XK_XF86_XF86BackForward': 0x1008ff3f,
+    'XK_XF86_Launch0': 0x1008ff40,
+    'XK_XF86_Launch1': 0x1008ff41,
+    'XK_XF86_Launch2': 0x1008ff42,
+    'XK_XF86_Launch3': 0x1008ff43,
+    'XK_XF86_Launch4': 0x1008ff44,
+    'XK_XF86_Launch5': 0x1008ff45,
+    'XK_XF86_Launch6': 0x1008ff46,
+    'XK_XF86_Launch7': 0x1008ff47,
+    'XK_XF86_Launch8': 0x1008ff48,
+    'XK_XF86_Launch9': 0x1008ff49,
+    'XK_XF86_LaunchA': 0x1008ff4a,
+    'XK_XF86_LaunchB': 0x1008ff4b,
+    'XK_XF86_LaunchC': 0x1008ff4c,
+    'XK_XF86_LaunchD': 0x1008ff4d,
+    'XK_XF86_LaunchE': 0x1008ff4e,
+    'XK_XF86_LaunchF': 0x1008ff4f,
+    'XK_XF86_ApplicationLeft': 0x1008ff50,
+    'XK_XF86_ApplicationRight': 0x1008ff51,
+    'XK_XF86_Book': 0x1008ff52,
+    'XK_XF86_CD': 0x1008ff53,
+    'XK_XF86_Calculater': 0x1008ff54,
+    'XK_XF86_Clear': 0x1008ff55,
+    'XK_XF86_Close': 0x1008ff56,
+    'XK_XF86_Copy': 0x1008ff57,
+    'XK_XF86_Cut': 0x1008ff58,
+    'XK_XF86_Display': 0x1008ff59,
+    'XK_XF86_DOS': 0x1008ff5a,
+    'XK_XF86_Documents': 0x1008ff5b,
+    'XK_XF86_Excel': 0x1008ff5c,
+    'XK_XF86_Explorer': 0x1008ff5d,
+    'XK_XF86_Game': 0x1008ff5e,
+    'XK_XF86_Go': 0x1008ff5f,
+    'XK_XF86_iTouch': 0x1008ff60,
+    'XK_XF86_LogOff': 0x1008ff61,
+    'XK_XF86_Market': 0x1008ff62,
+    'XK_XF86_Meeting': 0x1008ff63,
+    'XK_XF86_MenuKB': 0x1008ff65,
+    'XK_XF86_MenuPB': 0x1008ff66,
+    'XK_XF86_MySites': 0x1008ff67,
+    'XK_XF86_New': 0x1008ff68,
+    'XK_XF86_News': 0x1008ff69,
+    'XK_XF86_OfficeHome': 0x1008ff6a,
+    'XK_XF86_Open': 0x1008ff6b,
+    'XK_XF86_Option': 0x1008ff6c,
+    'XK_XF86_Paste': 0x1008ff6d,
+    'XK_XF86_Phone': 0x1008ff6e,
+    'XK_XF86_Q': 0x1008ff70,
+    'XK_XF86_Reply': 0x1008ff72,
+    'XK_XF86_Reload': 0x1008ff73,
+    'XK_XF86_RotateWindows': 0x1008ff74,
+    'XK_XF86_RotationPB': 0x1008ff75,
+    'XK_XF86_RotationKB': 0x1008ff76,
+    'XK_XF86_Save': 0x1008ff77,
+    'XK_XF86_ScrollUp': 0x1008ff78,
+    'XK_XF86_ScrollDown': 0x1008ff79,
+    'XK_XF86_ScrollClick': 0x1008ff7a,
+    'XK_XF86_Send': 0x1008ff7b,
+    'XK_XF86_Spell': 0x1008ff7c,
+    'XK_XF86_SplitScreen': 0x1008ff7d,
+    'XK_XF86_Support': 0x1008ff7e,
+    'XK_XF86_TaskPane': 0x1008ff7f,
+    'XK_XF86_Terminal': 0x1008ff80,
+    'XK_XF86_Tools': 0x1008ff81,
+    'XK_XF86_Travel': 0x1008ff82,
+    'XK_XF86_UserPB': 0x1008ff84,
+    'XK_XF86_User1KB': 0x1008ff85,
+    'XK_XF86_User2KB': 0x1008ff86,
+    'XK_XF86_Video': 0x1008ff87,
+    'XK_XF86_WheelButton': 0x1008ff88,
+    'XK_XF86_Word': 0x1008ff89,
+    'XK_XF86_Xfer': 0x1008ff8a,
+    'XK_XF86_ZoomIn': 0x1008ff8b,
+    'XK_XF86_ZoomOut': 0x1008ff8c,
+    'XK_XF86_Away': 0x1008ff8d,
+    'XK_XF86_Messenger': 0x1008ff8e,
+    'XK_XF86_WebCam': 0x1008ff8f,
+    'XK_XF86_MailForward': 0x1008ff90,
+    'XK_XF86_Pictures': 0x1008ff91,
+    'XK_XF86_Music': 0x1008ff92,
+    'XK_XF86_Battery': 0x1008ff93,
+    'XK_XF86_Bluetooth': 0x1008ff94,
+    'XK_XF86_WLAN': 0x1008ff95,
+    'XK_XF86_UWB': 0x1008ff96,
+    'XK_XF86_AudioForward': 0x1008ff97,
+    'XK_XF86_AudioRepeat': 0x1008ff98,
+    'XK_XF86_AudioRandomPlay': 0x1008ff99,
+    'XK_XF86_Subtitle': 0x1008ff9a,
+    'XK_XF86_AudioCycleTrack': 0x1008ff9b,
+    'XK_XF86_CycleAngle': 0x1008ff9c,
+    'XK_XF86_FrameBack': 0x1008ff9d,
+    'XK_XF86_FrameForward': 0x1008ff9e,
+    'XK_XF86_Time': 0x1008ff9f,
+    'XK_XF86_Select': 0x1008ffa0,
+    'XK_XF86_View': 0x1008ffa1,
+    'XK_XF86_TopMenu': 0x1008ffa2,
+    'XK_XF86_Red': 0x1008ffa3,
+    'XK_XF86_Green': 0x1008ffa4,
+    'XK_XF86_Yellow': 0x1008ffa5,
+    'XK_XF86_Blue': 0x1008ffa6,
+    'XK_XF86_Suspend': 0x1008ffa7,
+    'XK_XF86_Hibernate': 0x1008ffa8,
+    'XK_XF86_TouchpadToggle': 0x1008ffa9,
+    'XK_XF86_TouchpadOn': 0x1008ffb0,
+    'XK_XF86_TouchpadOff': 0x1008ffb1,
+    'XK_XF86_AudioMicMute': 0x1008ffb2,
+    'XK_XF86_Keyboard': 0x1008ffb3,
+    'XK_XF86_WWAN': 0x1008ffb4,
+    'XK_XF86_RFKill': 0x1008ffb5,
+    'XK_XF86_AudioPreset': 0x1008ffb6,
+    'XK_XF86_RotationLockToggle': 0x1008ffb7,
+    'XK_XF86_FullScreen': 0x1008ffb8,
+    'XK_XF86_Switch_VT_1': 0x1008fe01,
+    'XK_XF86_Switch_VT_2': 0x1008fe02,
+    'XK_XF86_Switch_VT_3': 0x1008fe03,
+    'XK_XF86_Switch_VT_4': 0x1008fe04,
+    'XK_XF86_Switch_VT_5': 0x1008fe05,
+    'XK_XF86_Switch_VT_6': 0x1008fe06,
+    'XK_XF86_Switch_VT_7': 0x1008fe07,
+    'XK_XF86_Switch_VT_8': 0x1008fe08,
+    'XK_XF86_Switch_VT_9': 0x1008fe09,
+    'XK_XF86_Switch_VT_10': 0x1008fe0a,
+    'XK_XF86_Switch_VT_11': 0x1008fe0b,
+    'XK_XF86_Switch_VT_12': 0x1008fe0c,
+    'XK_XF86_Ungrab': 0x1008fe20,
+    'XK_XF86_ClearGrab': 0x1008fe21,
+    'XK_XF86_Next_VMode': 0x1008fe22,
+    'XK_XF86_Prev_VMode': 0x1008fe23,
+    'XK_XF86_LogWindowTree': 0x1008fe24,
+    'XK_XF86_LogGrabInfo': 0x1008fe25,
+}
+
+keysyms = {
+    0xff08: 'XK_BackSpace',
+    0xff09: 'XK_Tab',
+    0xff0a: 'XK_Linefeed',
+    0xff0b: 'XK_Clear',
+    0xff0d: 'XK_Return',
+    0xff13: 'XK_Pause',
+    0xff14: 'XK_Scroll_Lock',
+    0xff15: 'XK_Sys_Req',
+    0xff1b: 'XK_Escape',
+    0xffff: 'XK_Delete',
+    0xff20: 'XK_Multi_key',
+    0xff3c: 'XK_SingleCandidate',
+    0xff3d: 'XK_Zen_Koho',
+    0xff3e: 'XK_Mae_Koho',
+    0xff21: 'XK_Kanji',
+    0xff22: 'XK_Muhenkan',
+    0xff23: 'XK_Henkan',
+    0xff24: 'XK_Romaji',
+    0xff25: 'XK_Hiragana',
+    0xff26: 'XK_Katakana',
+    0xff27: 'XK_Hiragana_Katakana',
+    0xff28: 'XK_Zenkaku',
+    0xff29: 'XK_Hankaku',
+    0xff2a: 'XK_Zenkaku_Hankaku',
+    0xff2b: 'XK_Touroku',
+    0xff2c: 'XK_Massyo',
+    0xff2d: 'XK_Kana_Lock',
+    0xff2e: 'XK_Kana_Shift',
+    0xff2f: 'XK_Eisu_Shift',
+    0xff30: 'XK_Eisu_toggle',
+    0xff50: 'XK_Home',
+    0xff51: 'XK_Left',
+    0xff52: 'XK_Up',
+    0xff53: 'XK_Right',
+    0xff54: 'XK_Down',
+    0xff55: 'XK_Page_Up',
+    0xff56: 'XK_Page_Down',
+    0xff57: 'XK_End',
+    0xff58: 'XK_Begin',
+    0xff60: 'XK_Select',
+    0xff61: 'XK_Print',
+    0xff62: 'XK_Execute',
+    0xff63: 'XK_Insert',
+    0xff65: 'XK_Undo',
+    0xff66: 'XK_Redo',
+    0xff67: 'XK_Menu',
+    0xff68: 'XK_Find',
+    0xff69: 'XK_Cancel',
+    0xff6a: 'XK_Help',
+    0xff6b: 'XK_Break',
+    0xff7e: 'XK_ISO_Group_Shift',
+    0xff7f: 'XK_Num_Lock',
+    0xff80: 'XK_KP_Space',
+    0xff89: 'XK_KP_Tab',
+    0xff8d: 'XK_KP_Enter',
+    0xff91: 'XK_KP_F1',
+    0xff92: 'XK_KP_F2',
+    0xff93: 'XK_KP_F3',
+    0xff94: 'XK_KP_F4',
+    0xff95: 'XK_KP_Home',
+    0xff96: 'XK_KP_Left',
+    0xff97: 'XK_KP_Up',
+    0xff98: 'XK_KP_Right',
+    0xff99: 'XK_KP_Down',
+    0xff9a: 'XK_KP_Page_Up',
+    0xff9b: 'XK_KP_Page_Down',
+    0xff9c: 'XK_KP_End',
+    0xff9d: 'XK_KP_Begin',
+    0xff9e: 'XK_KP_Insert',
+    0xff9f: 'XK_KP_Delete',
+    0xffbd: 'XK_KP_Equal',
+    0xffaa: 'XK_KP_Multiply',
+    0xffab: 'XK_KP_Add',
+    0xffac: 'XK_KP_Separator',
+    0xffad: 'XK_KP_Subtract',
+    0xffae: 'XK_KP_Decimal',
+    0xffaf: 'XK_KP_Divide',
+    0xffb0: 'XK_KP_0',
+    0xffb1: 'XK_KP_1',
+    0xffb2: 'XK_KP_2',
+    0xffb3: 'XK_KP_3',
+    0xffb4: 'XK_KP_4',
+    0xffb5: 'XK_KP_5',
+    0xffb6: 'XK_KP_6',
+    0xffb7: 'XK_KP_7',
+    0xffb8: 'XK_KP_8',
+    0xffb9: 'XK_KP_9',
+    0xffbe: 'XK_F1',
+    0xffbf: 'XK_F2',
+    0xffc0: 'XK_F3',
+    0xffc1: 'XK_F4',
+    0xffc2: 'XK_F5',
+    0xffc3: 'XK_F6',
+    0xffc4: 'XK_F7',
+    0xffc5: 'XK_F8',
+    0xffc6: 'XK_F9',
+    0xffc7: 'XK_F10',
+    0xffc8: 'XK_L1',
+    0xffc9: 'XK_L2',
+    0xffca: 'XK_L3',
+    0xffcb: 'XK_L4',
+    0xffcc: 'XK_L5',
+    0xffcd: 'XK_L6',
+    0xffce: 'XK_L7',
+    0xffcf: 'XK_L8',
+    0xffd0: 'XK_L9',
+    0xffd1: 'XK_L10',
+    0xffd2: 'XK_R1',
+    0xffd3: 'XK_R2',
+    0xffd4: 'XK_R3',
+    0xffd5: 'XK_R4',
+    0xffd6: 'XK_R5',
+    0xffd7: 'XK_R6',
+    0xffd8: 'XK_R7',
+    0xffd9: 'XK_R8',
+    0xffda: 'XK_R9',
+    0xffdb: 'XK_R10',
+    0xffdc: 'XK_R11',
+    0xffdd: 'XK_R12',
+    0xffde: 'XK_R13',
+    0xffdf: 'XK_R14',
+    0xffe0: 'XK_R15',
+    0xffe1: 'XK_Shift_L',
+    0xffe2: 'XK_Shift_R',
+    0xffe3: 'XK_Control_L',
+    0xffe4: 'XK_Control_R',
+    0xffe5: 'XK_Caps_Lock',
+    0xffe6: 'XK_Shift_Lock',
+    0xffe7: 'XK_Meta_L',
+    0xffe8: 'XK_Meta_R',
+    0xffe9: 'XK_Alt_L',
+    0xffea: 'XK_Alt_R',
+    0xffeb: 'XK_Super_L',
+    0xffec: 'XK_Super_R',
+    0xffed: 'XK_Hyper_L',
+    0xffee: 'XK_Hyper_R',
+    0x20: 'XK_space',
+    0x21: 'XK_exclam',
+    0x22: 'XK_quotedbl',
+    0x23: 'XK_numbersign',
+    0x24: 'XK_dollar',
+    0x25: 'XK_percent',
+    0x26: 'XK_ampersand',
+    0x27: 'XK_quoteright',
+    0x28: 'XK_parenleft',
+    0x29: 'XK_parenright',
+    0x2a: 'XK_asterisk',
+    0x2b: 'XK_plus',
+    0x2c: 'XK_comma',
+    0x2d: 'XK_minus',
+    0x2e: 'XK_period',
+    0x2f: 'XK_slash',
+    0x30: 'XK_0',
+    0x31: 'XK_1',
+    0x32: 'XK_2',
+    0x33: 'XK_3',
+    0x34: 'XK_4',
+    0x35: 'XK_5',
+    0x36: 'XK_6',
+    0x37: 'XK_7',
+    0x38: 'XK_8',
+    0x39: 'XK_9',
+    0x3a: 'XK_colon',
+    0x3b: 'XK_semicolon',
+    0x3c: 'XK_less',
+    0x3d: 'XK_equal',
+    0x3e: 'XK_greater',
+    0x3f: 'XK_question',
+    0x40: 'XK_at',
+    0x41: 'XK_A',
+    0x42: 'XK_B',
+    0x43: 'XK_C',
+    0x44: 'XK_D',
+    0x45: 'XK_E',
+    0x46: 'XK_F',
+    0x47: 'XK_G',
+    0x48: 'XK_H',
+    0x49: 'XK_I',
+    0x4a: 'XK_J',
+    0x4b: 'XK_K',
+    0x4c: 'XK_L',
+    0x4d: 'XK_M',
+    0x4e: 'XK_N',
+    0x4f: 'XK_O',
+    0x50: 'XK_P',
+    0x51: 'XK_Q',
+    0x52: 'XK_R',
+    0x53: 'XK_S',
+    0x54: 'XK_T',
+    0x55: 'XK_U',
+    0x56: 'XK_V',
+    0x57: 'XK_W',
+    0x58: 'XK_X',
+    0x59: 'XK_Y',
+    0x5a: 'XK_Z',
+    0x5b: 'XK_bracketleft',
+    0x5c: 'XK_backslash',
+    0x5d: 'XK_bracketright',
+    0x5e: 'XK_asciicircum',
+    0x5f: 'XK_underscore',
+    0x60: 'XK_quoteleft',
+    0x61: 'XK_a',
+    0x62: 'XK_b',
+    0x63: 'XK_c',
+    0x64: 'XK_d',
+    0x65: 'XK_e',
+    0x66: 'XK_f',
+    0x67: 'XK_g',
+    0x68: 'XK_h',
+    0x69: 'XK_i',
+    0x6a: 'XK_j',
+    0x6b: 'XK_k',
+    0x6c: 'XK_l',
+    0x6d: 'XK_m',
+    0x6e: 'XK_n',
+    0x6f: 'XK_o',
+    0x70: 'XK_p',
+    0x71: 'XK_q',
+    0x72: 'XK_r',
+    0x73: 'XK_s',
+    0x74: 'XK_t',
+    0x75: 'XK_u',
+    0x76: 'XK_v',
+    0x77: 'XK_w',
+    0x78: 'XK_x',
+    0x79: 'XK_y',
+    0x7a: 'XK_z',
+    0x7b: 'XK_braceleft',
+    0x7c: 'XK_bar',
+    0x7d: 'XK_braceright',
+    0x7e: 'XK_asciitilde',
+    0xa0: 'XK_nobreakspace',
+    0xa1: 'XK_exclamdown',
+    0xa2: 'XK_cent',
+    0xa3: 'XK_sterling',
+    0xa4: 'XK_currency',
+    0xa5: 'XK_yen',
+    0xa6: 'XK_brokenbar',
+    0xa7: 'XK_section',
+    0xa8: 'XK_diaeresis',
+    0xa9: 'XK_copyright',
+    0xaa: 'XK_ordfeminine',
+    0xab: 'XK_guillemotleft',
+    0xac: 'XK_notsign',
+    0xad: 'XK_hyphen',
+    0xae: 'XK_registered',
+    0xaf: 'XK_macron',
+    0xb0: 'XK_degree',
+    0xb1: 'XK_plusminus',
+    0xb2: 'XK_twosuperior',
+    0xb3: 'XK_threesuperior',
+    0xb4: 'XK_acute',
+    0xb5: 'XK_mu',
+    0xb6: 'XK_paragraph',
+    0xb7: 'XK_periodcentered',
+    0xb8: 'XK_cedilla',
+    0xb9: 'XK_onesuperior',
+    0xba: 'XK_masculine',
+    0xbb: 'XK_guillemotright',
+    0xbc: 'XK_onequarter',
+    0xbd: 'XK_onehalf',
+    0xbe: 'XK_threequarters',
+    0xbf: 'XK_questiondown',
+    0xc0: 'XK_Agrave',
+    0xc1: 'XK_Aacute',
+    0xc2: 'XK_Acircumflex',
+    0xc3: 'XK_Atilde',
+    0xc4: 'XK_Adiaeresis',
+    0xc5: 'XK_Aring',
+    0xc6: 'XK_AE',
+    0xc7: 'XK_Ccedilla',
+    0xc8: 'XK_Egrave',
+    0xc9: 'XK_Eacute',
+    0xca: 'XK_Ecircumflex',
+    0xcb: 'XK_Ediaeresis',
+    0xcc: 'XK_Igrave',
+    0xcd: 'XK_Iacute',
+    0xce: 'XK_Icircumflex',
+    0xcf: 'XK_Idiaeresis',
+    0xd0: 'XK_Eth',
+    0xd1: 'XK_Ntilde',
+    0xd2: 'XK_Ograve',
+    0xd3: 'XK_Oacute',
+    0xd4: 'XK_Ocircumflex',
+    0xd5: 'XK_Otilde',
+    0xd6: 'XK_Odiaeresis',
+    0xd7: 'XK_multiply',
+    0xd8: 'XK_Ooblique',
+    0xd9: 'XK_Ugrave',
+    0xda: 'XK_Uacute',
+    0xdb: 'XK_Ucircumflex',
+    0xdc: 'XK_Udiaeresis',
+    0xdd: 'XK_Yacute',
+    0xde: 'XK_Thorn',
+    0xdf: 'XK_ssharp',
+    0xe0: 'XK_agrave',
+    0xe1: 'XK_aacute',
+    0xe2: 'XK_acircumflex',
+    0xe3: 'XK_atilde',
+    0xe4: 'XK_adiaeresis',
+    0xe5: 'XK_aring',
+    0xe6: 'XK_ae',
+    0xe7: 'XK_ccedilla',
+    0xe8: 'XK_egrave',
+    0xe9: 'XK_eacute',
+    0xea: 'XK_ecircumflex',
+    0xeb: 'XK_ediaeresis',
+    0xec: 'XK_igrave',
+    0xed: 'XK_iacute',
+    0xee: 'XK_icircumflex',
+    0xef: 'XK_idiaeresis',
+    0xf0: 'XK_eth',
+    0xf1: 'XK_ntilde',
+    0xf2: 'XK_ograve',
+    0xf3: 'XK_oacute',
+    0xf4: 'XK_ocircumflex',
+    0xf5: 'XK_otilde',
+    0xf6: 'XK_odiaeresis',
+    0xf7: 'XK_division',
+    0xf8: 'XK_oslash',
+    0xf9: 'XK_ugrave',
+    0xfa: 'XK_uacute',
+    0xfb: 'XK_ucircumflex',
+    0xfc: 'XK_udiaeresis',
+    0xfd: 'XK_yacute',
+    0xfe: 'XK_thorn',
+    0xff: 'XK_ydiaeresis',
+    0xfe01: 'XK_ISO_Lock',
+    0xfe02: 'XK_ISO_Level2_Latch',
+    0xfe03: 'XK_ISO_Level3_Shift',
+    0xfe04: 'XK_ISO_Level3_Latch',
+    0xfe05: 'XK_ISO_Level3_Lock',
+    0xfe06: 'XK_ISO_Group_Latch',
+    0xfe07: 'XK_ISO_Group_Lock',
+    0xfe08: 'XK_ISO_Next_Group',
+    0xfe09: 'XK_ISO_Next_Group_Lock',
+    0xfe0a: 'XK_ISO_Prev_Group',
+    0xfe0b: 'XK_ISO_Prev_Group_Lock',
+    0xfe0c: 'XK_ISO_First_Group',
+    0xfe0d: 'XK_ISO_First_Group_Lock',
+    0xfe0e: 'XK_ISO_Last_Group',
+    0xfe0f: 'XK_ISO_Last_Group_Lock',
+    0xfe20: 'XK_ISO_Left_Tab',
+    0xfe21: 'XK_ISO_Move_Line_Up',
+    0xfe22: 'XK_ISO_Move_Line_Down',
+    0xfe23: 'XK_ISO_Partial_Line_Up',
+    0xfe24: 'XK_ISO_Partial_Line_Down',
+    0xfe25: 'XK_ISO_Partial_Space_Left',
+    0xfe26: 'XK_ISO_Partial_Space_Right',
+    0xfe27: 'XK_ISO_Set_Margin_Left',
+    0xfe28: 'XK_ISO_Set_Margin_Right',
+    0xfe29: 'XK_ISO_Release_Margin_Left',
+    0xfe2a: 'XK_ISO_Release_Margin_Right',
+    0xfe2b: 'XK_ISO_Release_Both_Margins',
+    0xfe2c: 'XK_ISO_Fast_Cursor_Left',
+    0xfe2d: 'XK_ISO_Fast_Cursor_Right',
+    0xfe2e: 'XK_ISO_Fast_Cursor_Up',
+    0xfe2f: 'XK_ISO_Fast_Cursor_Down',
+    0xfe30: 'XK_ISO_Continuous_Underline',
+    0xfe31: 'XK_ISO_Discontinuous_Underline',
+    0xfe32: 'XK_ISO_Emphasize',
+    0xfe33: 'XK_ISO_Center_Object',
+    0xfe34: 'XK_ISO_Enter',
+    0xfe50: 'XK_dead_grave',
+    0xfe51: 'XK_dead_acute',
+    0xfe52: 'XK_dead_circumflex',
+    0xfe53: 'XK_dead_tilde',
+    0xfe54: 'XK_dead_macron',
+    0xfe55: 'XK_dead_breve',
+    0xfe56: 'XK_dead_abovedot',
+    0xfe57: 'XK_dead_diaeresis',
+    0xfe58: 'XK_dead_abovering',
+    0xfe59: 'XK_dead_doubleacute',
+    0xfe5a: 'XK_dead_caron',
+    0xfe5b: 'XK_dead_cedilla',
+    0xfe5c: 'XK_dead_ogonek',
+    0xfe5d: 'XK_dead_iota',
+    0xfe5e: 'XK_dead_voiced_sound',
+    0xfe5f: 'XK_dead_semivoiced_sound',
+    0xfe60: 'XK_dead_belowdot',
+    0xfed0: 'XK_First_Virtual_Screen',
+    0xfed1: 'XK_Prev_Virtual_Screen',
+    0xfed2: 'XK_Next_Virtual_Screen',
+    0xfed4: 'XK_Last_Virtual_Screen',
+    0xfed5: 'XK_Terminate_Server',
+    0xfe70: 'XK_AccessX_Enable',
+    0xfe71: 'XK_AccessX_Feedback_Enable',
+    0xfe72: 'XK_RepeatKeys_Enable',
+    0xfe73: 'XK_SlowKeys_Enable',
+    0xfe74: 'XK_BounceKeys_Enable',
+    0xfe75: 'XK_StickyKeys_Enable',
+    0xfe76: 'XK_MouseKeys_Enable',
+    0xfe77: 'XK_MouseKeys_Accel_Enable',
+    0xfe78: 'XK_Overlay1_Enable',
+    0xfe79: 'XK_Overlay2_Enable',
+    0xfe7a: 'XK_AudibleBell_Enable',
+    0xfee0: 'XK_Pointer_Left',
+    0xfee1: 'XK_Pointer_Right',
+    0xfee2: 'XK_Pointer_Up',
+    0xfee3: 'XK_Pointer_Down',
+    0xfee4: 'XK_Pointer_UpLeft',
+    0xfee5: 'XK_Pointer_UpRight',
+    0xfee6: 'XK_Pointer_DownLeft',
+    0xfee7: 'XK_Pointer_DownRight',
+    0xfee8: 'XK_Pointer_Button_Dflt',
+    0xfee9: 'XK_Pointer_Button1',
+    0xfeea: 'XK_Pointer_Button2',
+    0xfeeb: 'XK_Pointer_Button3',
+    0xfeec: 'XK_Pointer_Button4',
+    0xfeed: 'XK_Pointer_Button5',
+    0xfeee: 'XK_Pointer_DblClick_Dflt',
+    0xfeef: 'XK_Pointer_DblClick1',
+    0xfef0: 'XK_Pointer_DblClick2',
+    0xfef1: 'XK_Pointer_DblClick3',
+    0xfef2: 'XK_Pointer_DblClick4',
+    0xfef3: 'XK_Pointer_DblClick5',
+    0xfef4: 'XK_Pointer_Drag_Dflt',
+    0xfef5: 'XK_Pointer_Drag1',
+    0xfef6: 'XK_Pointer_Drag2',
+    0xfef7: 'XK_Pointer_Drag3',
+    0xfef8: 'XK_Pointer_Drag4',
+    0xfefd: 'XK_Pointer_Drag5',
+    0xfef9: 'XK_Pointer_EnableKeys',
+    0xfefa: 'XK_Pointer_Accelerate',
+    0xfefb: 'XK_Pointer_DfltBtnNext',
+    0xfefc: 'XK_Pointer_DfltBtnPrev',
+    0x1008ff01: 'XK_XF86_ModeLock',
+    0x1008ff02: 'XK_XF86_MonBrightnessUp',
+    0x1008ff03: 'XK_XF86_MonBrightnessDown',
+    0x1008ff04: 'XK_XF86_KbdLightOnOff',
+    0x1008ff05: 'XK_XF86_KbdBrightnessUp',
+    0x1008ff06: 'XK_XF86_KbdBrightnessDown',
+    0x1008ff07: 'XK_XF86_MonBrightnessCycle',
+    0x1008ff10: 'XK_XF86_Standby',
+    0x1008ff11: 'XK_XF86_AudioLowerVolume',
+    0x1008ff12: 'XK_XF86_AudioMute',
+    0x1008ff13: 'XK_XF86_AudioRaiseVolume',
+    0x1008ff14: 'XK_XF86_AudioPlay',
+    0x1008ff15: 'XK_XF86_AudioStop',
+    0x1008ff16: 'XK_XF86_AudioPrev',
+    0x1008ff17: 'XK_XF86_AudioNext',
+    0x1008ff18: 'XK_XF86_HomePage',
+    0x1008ff19: 'XK_XF86_Mail',
+    0x1008ff1a: 'XK_XF86_Start',
+    0x1008ff1b: 'XK_XF86_Search',
+    0x1008ff1c: 'XK_XF86_AudioRecord',
+    0x1008ff1d: 'XK_XF86_Calculator',
+    0x1008ff1e: 'XK_XF86_Memo',
+    0x1008ff1f: 'XK_XF86_ToDoList',
+    0x1008ff20: 'XK_XF86_Calendar',
+    0x1008ff21: 'XK_XF86_PowerDown',
+    0x1008ff22: 'XK_XF86_ContrastAdjust',
+    0x1008ff23: 'XK_XF86_RockerUp',
+    0x1008ff24: 'XK_XF86_RockerDown',
+    0x1008ff25: 'XK_XF86_RockerEnter',
+    0x1008ff26: 'XK_XF86_Back',
+    0x1008ff27: 'XK_XF86_Forward',
+    0x1008ff28: 'XK_XF86_Stop',
+    0x1008ff29: 'XK_XF86_Refresh',
+    0x1008ff2a: 'XK_XF86_PowerOff',
+    0x1008ff2b: 'XK_XF86_WakeUp',
+    0x1008ff2c: 'XK_XF86_Eject',
+    0x1008ff2d: 'XK_XF86_ScreenSaver',
+    0x1008ff2e: 'XK_XF86_WWW',
+    0x1008ff2f: 'XK_XF86_Sleep',
+    0x1008ff30: 'XK_XF86_Favorites',
+    0x1008ff31: 'XK_XF86_AudioPause',
+    0x1008ff32: 'XK_XF86_AudioMedia',
+    0x1008ff33: 'XK_XF86_MyComputer',
+    0x1008ff34: 'XK_XF86_VendorHome',
+    0x1008ff35: 'XK_XF86_LightBulb',
+    0x1008ff36: 'XK_XF86_Shop',
+    0x1008ff37: 'XK_XF86_History',
+    0x1008ff38: 'XK_XF86_OpenURL',
+    0x1008ff39: 'XK_XF86_AddFavorite',
+    0x1008ff3a: 'XK_XF86_HotLinks',
+    0x1008ff3b: 'XK_XF86_BrightnessAdjust',
+    0x1008ff3c: 'XK_XF86_Finance',
+    0x1008ff3d: 'XK_XF86_Community',
+    0x1008ff3e: 'XK_XF86_AudioRewind',
+    0x1008ff3f: 'XK_XF86_XF86BackForward',
+    0x1008ff40: 'XK_XF86_Launch0',
+    0x1008ff41: 'XK_XF86_Launch1',
+    0x1008ff42: 'XK_XF86_Launch2',
+    0x1008ff43: 'XK_XF86_Launch3',
+    0x1008ff44: 'XK_XF86_Launch4',
+    0x1008ff45: 'XK_XF86_Launch5',
+    0x1008ff46: 'XK_XF86_Launch6',
+    0x1008ff47: 'XK_XF86_Launch7',
+    0x1008ff48: 'XK_XF86_Launch8',
+    0x1008ff49: 'XK_XF86_Launch9',
+    0x1008ff4a: 'XK_XF86_LaunchA',
+    0x1008ff4b: 'XK_XF86_LaunchB',
+    0x1008ff4c: 'XK_XF86_LaunchC',
+    0x1008ff4d: 'XK_XF86_LaunchD',
+    0x1008ff4e: 'XK_XF86_LaunchE',
+    0x1008ff4f: 'XK_XF86_LaunchF',
+    0x1008ff50: 'XK_XF86_ApplicationLeft',
+    0x1008ff51: 'XK_XF86_ApplicationRight',
+    0x1008ff52: 'XK_XF86_Book',
+    0x1008ff53: 'XK_XF86_CD',
+    0x1008ff54: 'XK_XF86_Calculater',
+    0x1008ff55: 'XK_XF86_Clear',
+    0x1008ff56: 'XK_XF86_Close',
+    0x1008ff57: 'XK_XF86_Copy',
+    0x1008ff58: 'XK_XF86_Cut',
+    0x1008ff59: 'XK_XF86_Display',
+    0x1008ff5a: 'XK_XF86_DOS',
+    0x1008ff5b: 'XK_XF86_Documents',
+    0x1008ff5c: 'XK_XF86_Excel',
+    0x1008ff5d: 'XK_XF86_Explorer',
+    0x1008ff5e: 'XK_XF86_Game',
+    0x1008ff5f: 'XK_XF86_Go',
+    0x1008ff60: 'XK_XF86_iTouch',
+    0x1008ff61: 'XK_XF86_LogOff',
+    0x1008ff62: 'XK_XF86_Market',
+    0x1008ff63: 'XK_XF86_Meeting',
+    0x1008ff65: 'XK_XF86_MenuKB',
+    0x1008ff66: 'XK_XF86_MenuPB',
+    0x1008ff67: 'XK_XF86_MySites',
+    0x1008ff68: 'XK_XF86_New',
+    0x1008ff69: 'XK_XF86_News',
+    0x1008ff6a: 'XK_XF86_OfficeHome',
+    0x1008ff6b: 'XK_XF86_Open',
+    0x1008ff6c: 'XK_XF86_Option',
+    0x1008ff6d: 'XK_XF86_Paste',
+    0x1008ff6e: 'XK_XF86_Phone',
+    0x1008ff70: 'XK_XF86_Q',
+    0x1008ff72: 'XK_XF86_Reply',
+    0x1008ff73: 'XK_XF86_Reload',
+    0x1008ff74: 'XK_XF86_RotateWindows',
+    0x1008ff75: 'XK_XF86_RotationPB',
+    0x1008ff76: 'XK_XF86_RotationKB',
+    0x1008ff77: 'XK_XF86_Save',
+    0x1008ff78: 'XK_XF86_ScrollUp',
+    0x1008ff79: 'XK_XF86_ScrollDown',
+    0x1008ff7a: 'XK_XF86_ScrollClick',
+    0x1008ff7b: 'XK_XF86_Send',
+    0x1008ff7c: 'XK_XF86_Spell',
+    0x1008ff7d: 'XK_XF86_SplitScreen',
+    0x1008ff7e: 'XK_XF86_Support',
+    0x1008ff7f: 'XK_XF86_TaskPane',
+    0x1008ff80: 'XK_XF86_Terminal',
+    0x1008ff81: 'XK_XF86_Tools',
+    0x1008ff82: 'XK_XF86_Travel',
+    0x1008ff84: 'XK_XF86_UserPB',
+    0x1008ff85: 'XK_XF86_User1KB',
+    0x1008ff86: 'XK_XF86_User2KB',
+    0x1008ff87: 'XK_XF86_Video',
+    0x1008ff88: 'XK_XF86_WheelButton',
+    0x1008ff89: 'XK_XF86_Word',
+    0x1008ff8a: 'XK_XF86_Xfer',
+    0x1008ff8b: 'XK_XF86_ZoomIn',
+    0x1008ff8c: 'XK_XF86_ZoomOut',
+    0x1008ff8d: 'XK_XF86_Away',
+    0x1008ff8e: 'XK_XF86_Messenger',
+    0x1008ff8f: 'XK_XF86_WebCam',
+    0x1008ff90: 'XK_XF86_MailForward',
+    0x1008ff91: 'XK_XF86_Pictures',
+    0x1008ff92: 'XK_XF86_Music',
+    0x1008ff93: 'XK_XF86_Battery',
+    0x1008ff94: 'XK_XF86_Bluetooth',
+    0x1008ff95: 'XK_XF86_WLAN',
+    0x1008ff96: 'XK_XF86_UWB',
+    0x1008ff97: 'XK_XF86_AudioForward',
+    0x1008ff98: 'XK_XF86_AudioRepeat',
+    0x1008ff99: 'XK_XF86_AudioRandomPlay',
+    0x1008ff9a: 'XK_XF86_Subtitle',
+    0x1008ff9b: 'XK_XF86_AudioCycleTrack',
+    0x1008ff9c: 'XK_XF86_CycleAngle',
+    0x1008ff9d: 'XK_XF86_FrameBack',
+    0x1008ff9e: 'XK_XF86_FrameForward',
+    0x1008ff9f: 'XK_XF86_Time',
+    0x1008ffa0: 'XK_XF86_Select',
+    0x1008ffa1: 'XK_XF86_View',
+    0x1008ffa2: 'XK_XF86_TopMenu',
+    0x1008ffa3: 'XK_XF86_Red',
+    0x1008ffa4: 'XK_XF86_Green',
+    0x1008ffa5: 'XK_XF86_Yellow',
+    0x1008ffa6: 'XK_XF86_Blue',
+    0x1008ffa7: 'XK_XF86_Suspend',
+    0x1008ffa8: 'XK_XF86_Hibernate',
+    0x1008ffa9: 'XK_XF86_TouchpadToggle',
+    0x1008ffb0: 'XK_XF86_TouchpadOn',
+    0x1008ffb1: 'XK_XF86_TouchpadOff',
+    0x1008ffb2: 'XK_XF86_AudioMicMute',
+    0x1008ffb3: 'XK_XF86_Keyboard',
+    0x1008ffb4: 'XK_XF86_WWAN',
+    0x1008ffb5: 'XK_XF86_RFKill',
+    0x1008ffb6: 'XK_XF86_AudioPreset',
+    0x1008ffb7: 'XK_XF86_RotationLockToggle',
+    0x1008ffb8: 'XK_XF86_FullScreen',
+    0x1008fe01: 'XK_XF86_Switch_VT_1',
+    0x1008fe02: 'XK_XF86_Switch_VT_2',
+    0x1008fe03: 'XK_XF86_Switch_VT_3',
+    0x1008fe04: 'XK_XF86_Switch_VT_4',
+    0x1008fe05: 'XK_XF86_Switch_VT_5',
+    0x1008fe06: 'XK_XF86_Switch_VT_6',
+    0x1008fe07: 'XK_XF86_Switch_VT_7',
+    0x1008fe08: 'XK_XF86_Switch_VT_8',
+    0x1008fe09: 'XK_XF86_Switch_VT_9',
+    0x1008fe0a: 'XK_XF86_Switch_VT_10',
+    0x1008fe0b: 'XK_XF86_Switch_VT_11',
+    0x1008fe0c: 'XK_XF86_Switch_VT_12',
+    0x1008fe20: 'XK_XF86_Ungrab',
+    0x1008fe21: 'XK_XF86_ClearGrab',
+    0x1008fe22: 'XK_XF86_Next_VMode',
+    0x1008fe23: 'XK_XF86_Prev_VMode',
+    0x1008fe24: 'XK_XF86_LogWindowTree',
+    0x1008fe25: 'XK_XF86_LogGrabInfo',
+}
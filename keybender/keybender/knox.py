@@ -1,7 +1,7 @@
 from Xlib.display import Display
 from Xlib import protocol, error
 from Xlib import X, XK, Xatom, Xutil
-from Xlib.ext import randr
+from Xlib.ext import randr, xtest
 from array import array
 import itertools
 import functools
@@ -9,6 +9,7 @@ import numbers
 import time, datetime
 import select
 import os
+import collections
 from collections import namedtuple
 from contextlib import contextmanager
 
@@ -16,30 +17,29 @@ from contextlib import contextmanager
 
 
 class Keysyms:
+    """Keysym names and values. The table is generated by mkkeysyms.py from
+    the keysymdef modules of python-xlib, and loaded on first use."""
 
     def __init__(self):
-        self.names = dict()
-        self.keysyms = dict()
-        from Xlib.keysymdef import miscellany
-        self.load_dict(miscellany.__dict__)
-        from Xlib.keysymdef import latin1
-        self.load_dict(latin1.__dict__)
-        from Xlib.keysymdef import xkb
-        self.load_dict(xkb.__dict__)
-        from Xlib.keysymdef import xf86
-        # this is missing from there, for some reason...
-        xf86.XK_XF86_AudioMicMute = 0x1008ffb2
-        self.load_dict(xf86.__dict__)
-
-    def load_dict(self, d):
-        for (name, keysym) in d.items():
-            if not (isinstance(name, str)
-                    and name.startswith("XK_")
-                    and isinstance(keysym, int)):
-                continue
-            self.names[name] = keysym
-            self.keysyms[keysym] = name
+        self._names = None
+        self._keysyms = None
+
+    def load(self):
+        from keybender import keysymtab
+        self._names = keysymtab.names
+        self._keysyms = keysymtab.keysyms
 
+    @property
+    def names(self):
+        if self._names is None:
+            self.load()
+        return self._names
+
+    @property
+    def keysyms(self):
+        if self._keysyms is None:
+            self.load()
+        return self._keysyms
 
     def __getitem__(self, name):
         if isinstance(name, str):
@@ -73,25 +73,29 @@ class Modifier:
         return self.common_name
 
 
-class Modifiers:
-    def __init__(self, knox, *mods):
+class ModifierMap:
+    """The modifier keys of the keyboard mapping, and which bits they set in
+    the state. Made once for a mapping, which takes one round trip. Calling
+    it with a bitmask gives the Modifiers value of those bits, there's one
+    for each bitmask."""
+    possible_aliases = { "Pointer_EnableKeys": "Num_Lock" }
+
+    def __init__(self, knox):
         self.knox = knox
-        self.modifiers = dict()
-        self.ordered_mods = list()
-        if mods:
-            for m in mods:
-                if isinstance(m, Modifier):
-                    self.add(m)
-                elif m is not None:
-                    # then must be iterable
-                    for mm in m:
-                        self.add(mm)
-            return
+        # in the order of the mapping
+        self.modifiers = list()
+        # full or common name -> first Modifier with it
+        self.by_name = dict()
+        # bit -> Modifier shown for it
+        self.by_bit = dict()
         processed_keysyms = set()
+        # every keycode of a modifier key
+        self.keycodes = set()
         for (bit, keys) in enumerate(knox.display.get_modifier_mapping()):
             for keycode in keys:
                 if keycode == 0:
                     continue
+                self.keycodes.add(keycode)
                 try:
                     for keysym in knox.keycode_to_keysym(keycode):
                         if not keysym or keysym in processed_keysyms:
@@ -100,151 +104,116 @@ class Modifiers:
                         self.add(Modifier(knox, keysym, bit))
                 except KeyError:
                     pass
+        # bits which have modifier keys
+        self.bits = 0
+        for bit in self.by_bit:
+            self.bits |= 1 << bit
+        self.values = dict()
+        self.none = self(0)
 
-    def all(self, named_only=False):
-        l = self.modifiers.get("bit", None)
-        if l is None:
-            return []
-        return [
-            m for m in itertools.chain.from_iterable(
-                    [ self.modifiers["bit"][b] for b in sorted(l.keys()) ])
-            if not named_only or m.full_name is not None ]
+    def add(self, m):
+        self.modifiers.append(m)
+        for name in (m.full_name, m.common_name):
+            self.by_name.setdefault(name, m)
+        shown = self.by_bit.get(m.bit)
+        if (shown is None
+            or self.possible_aliases.get(shown.common_name) == m.common_name):
+            self.by_bit[m.bit] = m
+
+    def __call__(self, bits):
+        bits &= 0xff
+        v = self.values.get(bits)
+        if v is None:
+            v = self.values[bits] = Modifiers(self, bits)
+        return v
+
+    def find(self, name=None, bit=None):
+        """The Modifier of the name, or shown for the bit"""
+        if name is not None:
+            return self.by_name.get(name)
+        return self.by_bit.get(bit)
 
-    def __contains__(self, m):
-        if not self.ordered_mods:
-            return False
-        mods = self.find(bit=m.bit)
-        if not mods:
-            return False
-        for m2 in mods:
-            if m == m2:
-                return True
-        return False
+    def all(self):
+        return self(self.bits)
 
-    def add(self, m):
-        if m in self.ordered_mods:
-            return
-        self.ordered_mods.append(m)
-        for a in [ "bit", "full_name", "common_name", "keysym" ]:
-            if a not in self.modifiers:
-                self.modifiers[a] = dict()
-            v = getattr(m, a)
-            if v not in self.modifiers[a]:
-                self.modifiers[a][v] = set()
-            self.modifiers[a][v].add(m)
+    def bit_names(self):
+        """name -> bit, equal for mappings which give the same bits"""
+        return { name: m.bit for (name, m) in self.by_name.items() }
+
+
+class Modifiers:
+    """Set of modifier bits, an immutable value with one instance for
+    each bitmask of a ModifierMap, so they can be compared with 'is' too"""
+    __slots__ = ('map', 'bits')
+
+    def __init__(self, modifier_map, bits):
+        self.map = modifier_map
+        self.bits = bits
+
+    def __setattr__(self, name, value):
+        if hasattr(self, 'bits'):
+            raise AttributeError("Modifiers can't be changed")
+        object.__setattr__(self, name, value)
+
+    def all(self):
+        """Modifier shown for each bit"""
+        return [ self.map.by_bit[bit] for bit in range(8)
+                 if self.bits & (1 << bit) and bit in self.map.by_bit ]
 
     def possible_values(self):
-        values = [ Modifiers(self.knox, []) ]
-        for m in self.simplified.all():
-            for i in range(len(values)):
-                values.append(values[i] | m)
+        """Every subset of the bits"""
+        values = []
+        sub = self.bits
+        while True:
+            values.append(self.map(sub))
+            if not sub:
+                break
+            sub = (sub - 1) & self.bits
         return values
 
-    def all(self):
-        return self.ordered_mods
+    def __contains__(self, m):
+        if isinstance(m, Modifier):
+            m = m.mask
+        return self.bits & m == m
 
-    def find(self, keysym=None, name=None, bit=None):
-        if not self.ordered_mods:
-            return None
-        if keysym is not None and keysym in self.modifiers["keysym"]:
-            return self.modifiers["keysym"][keysym]
-        if name is not None and name in self.modifiers["full_name"]:
-            return self.modifiers["full_name"][name]
-        if name is not None and name in self.modifiers["common_name"]:
-            return self.modifiers["common_name"][name]
-        if bit is not None and bit in self.modifiers["bit"]:
-            return self.modifiers["bit"][bit]
-        return None
+    def __int__(self):
+        return self.bits
 
-    def remove (self, **kwargs):
-        ms = self.find(**kwargs)
-        #print("REMOVING %r, %s" % (kwargs, ms))
-        for m in list(ms):
-            for a in [ "bit", "full_name", "common_name", "keysym" ]:
-                v = getattr(m, a, None)
-                if v is not None:
-                    self.modifiers[a][v].remove(m)
-                #print("Remained in %s:%r: %s" % (a, v, self.modifiers[a][v]))
-            self.ordered_mods.remove(m)
+    def __bool__(self):
+        return bool(self.bits)
 
-    @property
-    def bitmap(self):
-        bitmap = 0
-        for m in self.all():
-            bitmap |= 1 << m.bit
-        return bitmap
+    def __eq__(a, b):
+        if isinstance(b, Modifiers):
+            return a.bits == b.bits
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.bits)
 
     def __str__(self):
         return "+".join(map(str, self.all()))
 
+    def __repr__(self):
+        return "Modifiers(%s)" % self
 
-    def __invert__(self):
-        mods = Modifiers(self.knox, None)
-        for m in self.knox.modifiers.all():
-            if self.find(bit=m.bit) is None:
-                mods.add(m)
-        return mods
-
-    possible_aliases = { "Pointer_EnableKeys": "Num_Lock" }
-    @property
-    def simplified(self):
-        mods = Modifiers(self.knox, None)
-        for m in self.all():
-            mo = mods.find(bit=m.bit)
-            if not mo:
-                mods.add(m)
-            else:
-                for m2 in mo:
-                    if (m2.common_name in self.possible_aliases
-                        and self.possible_aliases[m2.common_name] == m.common_name):
-                        mods.remove(bit=m.bit)
-                        mods.add(m)
-                        break
-        return mods
-
+    @staticmethod
+    def mask_of(mod):
+        if isinstance(mod, Modifier):
+            return mod.mask
+        # Modifiers or int
+        return int(mod)
 
-    def __nonzero__(self):
-        if self.ordered_mods:
-            return True
-        else:
-            return False
+    def __invert__(self):
+        return self.map(self.map.bits & ~self.bits)
 
     def __and__(self, mod):
-        if isinstance(mod, Modifiers):
-            mr = Modifiers(self.knox, [])
-            for m in mr.all():
-                if m in self:
-                    mr.add(m)
-            return mr
-        elif isinstance(mod, int):
-            mr = Modifiers(self.knox, None)
-            for m in self.all():
-                if mod & (1 << m.bit):
-                    mr.add(m)
-            return mr
-
+        return self.map(self.bits & self.mask_of(mod))
 
     def __or__(self, mod):
-        if isinstance(mod, Modifier):
-            if self.find(bit=mod.bit):
-                return self
-            mr = Modifiers(self.knox, *self.all(), mod)
-            return mr
-        elif isinstance(mod, Modifiers):
-            mr = Modifiers(self.knox, None)
-            for m in mod.all():
-                mr.add(m)
-            for m in self.all():
-                mr.add(m)
-            return mr
-        elif isinstance(mod, int):
-            m_full = Modifiers(self.knox)
-            mr = Modifiers(self.knox, None)
-            for m in m_full.all():
-                if mod & (1 << m.bit) or self.find(bit=m.bit):
-                    mr.add(m)
-            return mr
-        assert False, "What %r" % type(mod)
+        return self.map(self.bits | self.mask_of(mod))
+
+    def __sub__(self, mod):
+        return self.map(self.bits & ~self.mask_of(mod))
 
 
 class Waiter:
@@ -294,10 +263,722 @@ class Waiter:
                     return False
         return True
 
+class KeyGrabs:
+    """Passive key grabs on the root window. update() is given every grab
+    wanted and only sends the difference from what's already installed.
+    Grabs on AnyModifier freeze the keyboard until the key press is either
+    taken or replayed to the focused window with allow_events."""
+    def __init__(self, knox):
+        self.knox = knox
+        # (keycode, modifiers) -> data given to update()
+        self.installed = dict()
+        self.grab_count = 0
+        self.ungrab_count = 0
+        self.time_spent = 0
+
+    def update(self, wanted, onerror=None):
+        """wanted maps (keycode, modifiers) to some data, onerror is called
+        with that data for the grabs that failed."""
+        started = time.perf_counter()
+        root = self.knox.root
+        removed = [ k for k in self.installed if k not in wanted ]
+        added = [ k for k in wanted if k not in self.installed ]
+        for k in removed:
+            (keycode, modifiers) = k
+            root.ungrab_key(keycode, modifiers)
+            del self.installed[k]
+        with self.knox.silenced_error(error.BadAccess):
+            for k in added:
+                (keycode, modifiers) = k
+                self.installed[k] = wanted[k]
+                if modifiers == X.AnyModifier:
+                    keyboard_mode = X.GrabModeSync
+                else:
+                    keyboard_mode = X.GrabModeAsync
+                root.grab_key(
+                    keycode, modifiers,
+                    True, X.GrabModeAsync, keyboard_mode,
+                    onerror=self.knox.error_handler(self.grab_failed, k, onerror))
+            if added:
+                # errors come back here
+                self.knox.sync()
+            elif removed:
+                self.knox.flush()
+        for k in wanted:
+            if k in self.installed:
+                self.installed[k] = wanted[k]
+        elapsed = time.perf_counter() - started
+        self.grab_count += len(added)
+        self.ungrab_count += len(removed)
+        self.time_spent += elapsed
+        print("Key grabs: +%d -%d, %d installed in %.1fms (%s)"
+              % (len(added), len(removed), len(self.installed),
+                 elapsed * 1000, self.stats()))
+
+    def grab_failed(self, k, onerror, *args, **kwargs):
+        data = self.installed.pop(k, None)
+        if onerror is not None:
+            onerror(data)
+
+    def release(self):
+        self.update(dict())
+
+    def __len__(self):
+        return len(self.installed)
+
+    def stats(self):
+        return ("%d grabs and %d ungrabs sent so far in %.1fms"
+                % (self.grab_count, self.ungrab_count, self.time_spent * 1000))
+
+
+class Overlay:
+    """Window shown while a chord waits for its next key. It's created and
+    set up once, then only mapped and unmapped. Being override-redirect it
+    is not managed, so it shows up right when it's mapped, without waiting
+    for the window manager to frame, place and activate it. The keyboard is
+    grabbed while it's shown, so it doesn't need the focus either."""
+    def __init__(self, knox, x=10, y=10, width=400, height=400):
+        self.knox = knox
+        screen = knox.screen
+        self.window = knox.root.create_window(
+            x, y, width, height, 1,
+            screen.root_depth,
+            background_pixel=screen.black_pixel,
+            override_redirect=True,
+            event_mask=X.ExposureMask | X.KeyPressMask | X.KeyReleaseMask)
+        self.gc = self.window.create_gc(
+            foreground=screen.white_pixel,
+            background=screen.black_pixel)
+        knox.set_opacity(self.window, 0.5)
+        knox.add_event_handler(X.Expose, self.expose)
+        self.visible = False
+        knox.flush()
+
+    @property
+    def id(self):
+        return self.window.id
+
+    def draw(self):
+        self.window.fill_rectangle(self.gc, 40, 40, 300, 300)
+        self.window.draw_text(self.gc, 10, 10, "Macilaci picipuci")
+
+    def expose(self, e):
+        if e.window.id != self.window.id:
+            return False
+        if self.visible and e.count == 0:
+            self.draw()
+        return True
+
+    def show(self):
+        """Returns True if the keyboard could be grabbed"""
+        self.window.configure(stack_mode=X.Above)
+        self.window.map()
+        self.visible = True
+        self.draw()
+        r = self.window.grab_keyboard(X.KeyPressMask | X.KeyReleaseMask,
+                                      X.GrabModeAsync, X.GrabModeAsync,
+                                      X.CurrentTime)
+        if r != X.GrabSuccess:
+            print("Cannot grab the keyboard: %r" % r)
+            return False
+        return True
+
+    def hide(self):
+        self.knox.display.ungrab_keyboard(X.CurrentTime)
+        self.window.unmap()
+        self.visible = False
+        self.knox.flush()
+
+
+class KeyInjector:
+    """Types keys with the XTEST extension, which the applications can't tell
+    from the keyboard, unlike the events of send_event. A key sequence is
+    compiled once to the list of fake key presses and releases, with the
+    modifier keys pressed around the keys needing them, and kept until the
+    keyboard mapping changes."""
+    Sequence = namedtuple("Sequence", "keys events")
+    # compiled sequences kept, the least recently used ones are dropped
+    max_sequences = 256
+
+    def __init__(self, knox):
+        self.knox = knox
+        ext = knox.display.query_extension(xtest.extname)
+        self.available = bool(ext and ext.present)
+        self.sequences = collections.OrderedDict()
+        self.serial = knox.keymap_serial
+
+    def char_keysym(self, c):
+        if c == "\n":
+            return XK.XK_Return
+        if c == "\t":
+            return XK.XK_Tab
+        if ord(c) < 0x100:
+            return ord(c)
+        # Unicode keysyms
+        return 0x01000000 + ord(c)
+
+    def text_keys(self, text):
+        return [ (self.char_keysym(c), self.knox.modifiers.none) for c in text ]
+
+    def modifier_keycodes(self, modifiers):
+        keycodes = []
+        for m in modifiers.all():
+            # pressing them would toggle the lock, not hold it
+            if m.bit == 1 or m.common_name.endswith("_Lock"):
+                continue
+            keycode = self.knox.keysym_to_keycode(m.keysym)
+            if keycode:
+                keycodes.append(keycode)
+        return keycodes
+
+    def level_state(self, keysym):
+        """Modifier bits for the level of the keysym on its key, Shift for
+        the second one"""
+        levels = self.knox.display.keysym_to_keycodes(keysym)
+        if levels and min(level for (_, level) in levels) == 1:
+            return X.ShiftMask
+        return 0
+
+    def compile_events(self, keys):
+        """(event type, keycode) list for (keysym, modifiers) pairs, or None
+        when a keysym can't be typed"""
+        events = []
+        held = []
+        for (keysym, modifiers) in keys:
+            levels = sorted(self.knox.display.keysym_to_keycodes(keysym),
+                            key=lambda k: k[1])
+            if not levels or levels[0][1] > 1:
+                # not on the keyboard, or needs a level shift key
+                return None
+            (keycode, level) = levels[0]
+            modifiers = self.knox.modifiers(int(modifiers) & self.knox.modifiers.bits)
+            if level == 1:
+                modifiers |= self.knox.modifiers(X.ShiftMask)
+            wanted = self.modifier_keycodes(modifiers)
+            # modifiers stay down for the next keys needing them too
+            for m in reversed(held):
+                if m not in wanted:
+                    events.append((X.KeyRelease, m))
+            held = [ m for m in held if m in wanted ]
+            for m in wanted:
+                if m not in held:
+                    events.append((X.KeyPress, m))
+                    held.append(m)
+            events.append((X.KeyPress, keycode))
+            events.append((X.KeyRelease, keycode))
+        for m in reversed(held):
+            events.append((X.KeyRelease, m))
+        return events
+
+    def compile(self, source, parse):
+        """Sequence for source, parse(source) gives the (keysym, modifiers)
+        pairs of it when it's not compiled yet"""
+        if self.serial != self.knox.keymap_serial:
+            self.sequences.clear()
+            self.serial = self.knox.keymap_serial
+        seq = self.sequences.get(source)
+        if seq is None:
+            keys = parse(source)
+            events = self.compile_events(keys) if self.available else None
+            seq = self.sequences[source] = self.Sequence(keys, events)
+            if len(self.sequences) > self.max_sequences:
+                self.sequences.popitem(last=False)
+        else:
+            self.sequences.move_to_end(source)
+        return seq
+
+    def held_modifiers(self):
+        """Keycodes of the modifier keys which are down, like the ones of
+        the hotkey running the action"""
+        keys = self.knox.display.query_keymap()
+        return [ keycode for keycode in sorted(self.knox.modifiers.keycodes)
+                 if keys[keycode // 8] & (1 << (keycode % 8)) ]
+
+    def inject(self, seq):
+        """Sends the fake input requests, the caller flushes them. The
+        modifiers held down would be added to the keys, so they're released
+        for the time of the sequence."""
+        held = self.held_modifiers()
+        for keycode in held:
+            self.knox.display.xtest_fake_input(X.KeyRelease, keycode)
+        for (event_type, keycode) in seq.events:
+            self.knox.display.xtest_fake_input(event_type, keycode)
+        for keycode in held:
+            self.knox.display.xtest_fake_input(X.KeyPress, keycode)
+
+
+class Completion:
+    """Handle of an operation which is done when an X event says so. check
+    is called with every event of the given types, and once it returns
+    something true that's the result. Without such an event in timeout
+    seconds the result is False.
+
+    From the event loop use add_done_callback, with attach to get the
+    timeout; wait() blocks on the connection until it's done, without
+    sleeping, keeping the events which are not for it."""
+    def __init__(self, knox, event_types=(), check=None, timeout=None):
+        self.knox = knox
+        self.event_types = event_types
+        self.check = check
+        if timeout is True:
+            # no numbers, like Waiter
+            timeout = 9999
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.done = False
+        self.result = None
+        self.callbacks = []
+        self.timer_key = None
+        self.event_loop = None
+        # request sent again every repeat_interval seconds until it's done
+        self.repeat_fn = None
+        self.repeat_interval = None
+        self.repeat_key = None
+        for t in event_types:
+            knox.add_event_handler(t, self.event)
+
+    @classmethod
+    def finished(cls, knox, result=True):
+        c = cls(knox)
+        c.finish(result)
+        return c
+
+    def event(self, e):
+        if not self.done and self.check is not None:
+            r = self.check(e)
+            if r:
+                self.finish(r)
+        # others may want it too
+        return False
+
+    def finish(self, result):
+        if self.done:
+            return
+        self.done = True
+        self.result = result
+        for t in self.event_types:
+            self.knox.remove_event_handler(t, self.event)
+        if self.timer_key is not None:
+            self.event_loop.unregister(self.timer_key)
+            self.timer_key = None
+        if self.repeat_key is not None:
+            self.event_loop.unregister(self.repeat_key)
+            self.repeat_key = None
+        for fn in self.callbacks:
+            fn(self)
+        self.callbacks = []
+
+    @property
+    def remaining(self):
+        if self.deadline is None:
+            return 0
+        return max(self.deadline - time.monotonic(), 0)
+
+    def expire(self, *args):
+        self.timer_key = None
+        if not self.done and not self.remaining:
+            print("Timed out waiting for %s" % (self.event_types,))
+            self.finish(False)
+
+    def add_done_callback(self, fn):
+        if self.done:
+            fn(self)
+        else:
+            self.callbacks.append(fn)
+
+    def repeat(self, fn, interval=0.1):
+        """Call fn every interval seconds until it's done. Many times the
+        window manager needs the request again, esp. when the mouse is not
+        inside the target window."""
+        self.repeat_fn = fn
+        self.repeat_interval = interval
+        if self.event_loop is not None:
+            self.start_repeating()
+
+    def start_repeating(self):
+        if not self.done and self.repeat_fn is not None and self.repeat_key is None:
+            self.repeat_key = self.event_loop.call_every(
+                self.repeat_interval, self.repeated)
+
+    def repeated(self, *args):
+        if not self.done:
+            self.repeat_fn()
+            self.knox.flush()
+
+    def attach(self, event_loop):
+        """Time out from the event loop"""
+        if not self.done and self.timer_key is None:
+            self.event_loop = event_loop
+            self.timer_key = event_loop.call_later(self.remaining, self.expire)
+            self.start_repeating()
+
+    def wait(self):
+        """Block until it's done, returns the result"""
+        self.knox.flush()
+        next_repeat = None
+        while not self.done:
+            if not self.remaining:
+                self.expire()
+                break
+            timeout = self.remaining
+            if self.repeat_fn is not None and self.repeat_key is None:
+                now = time.monotonic()
+                if next_repeat is None:
+                    next_repeat = now + self.repeat_interval
+                elif next_repeat <= now:
+                    self.repeated()
+                    next_repeat = now + self.repeat_interval
+                timeout = min(timeout, max(next_repeat - now, 0))
+            if not self.knox.pending():
+                select.select([ self.knox ], [], [], timeout)
+            self.knox.dispatch_pending()
+        return self.result
+
+
+class Monitors:
+    """Outputs of the screen and the CRTCs showing them, read with RandR.
+    RandR change notifications are selected on the root window, and the
+    whole model is read again, pipelined, when one comes."""
+    Monitor = namedtuple("Monitor", "index name output x y width height primary")
+
+    def __init__(self, knox):
+        self.knox = knox
+        self.monitors = []
+        self.connected = 0
+        self.refreshes = 0
+        ext = knox.display.query_extension(randr.extname)
+        self.available = bool(ext and ext.present)
+        if self.available:
+            knox.root.xrandr_select_input(
+                randr.RRScreenChangeNotifyMask
+                | randr.RRCrtcChangeNotifyMask
+                | randr.RROutputChangeNotifyMask)
+            for code in (randr.RRScreenChangeNotify, randr.RRNotify):
+                knox.add_event_handler(ext.first_event + code, self.changed)
+        self.refresh()
+
+    def refresh(self):
+        self.refreshes += 1
+        screen = self.knox.screen
+        self.screen = self.knox.Geometry(0, 0, screen.width_in_pixels,
+                                         screen.height_in_pixels)
+        if not self.available:
+            self.monitors = [ self.Monitor(0, "screen", 0, *self.screen, True) ]
+            self.connected = 1
+            return
+        display = self.knox.display.display
+        opcode = display.get_extension_major(randr.extname)
+        # current: doesn't make the server probe the outputs
+        res = self.knox.root.xrandr_get_screen_resources_current()
+        primary = randr.GetOutputPrimary(display=display, defer=True,
+                                         opcode=opcode, window=self.knox.root)
+        outputs = [
+            (output, randr.GetOutputInfo(
+                display=display, defer=True, opcode=opcode, output=output,
+                config_timestamp=res.config_timestamp))
+            for output in res.outputs ]
+        crtcs = dict(
+            (crtc, randr.GetCrtcInfo(
+                display=display, defer=True, opcode=opcode, crtc=crtc,
+                config_timestamp=res.config_timestamp))
+            for crtc in res.crtcs)
+        primary.reply()
+        monitors = []
+        connected = 0
+        for (output, info) in outputs:
+            info.reply()
+            if info.modes:
+                # has modes, empty if there's no monitor connected here
+                connected += 1
+            if not info.crtc or info.crtc not in crtcs:
+                continue
+            crtc = crtcs[info.crtc]
+            crtc.reply()
+            if not crtc.mode:
+                continue
+            monitors.append((output, info.name, crtc.x, crtc.y,
+                             crtc.width, crtc.height,
+                             output == primary.output))
+        # left to right, then top to bottom
+        monitors.sort(key=lambda m: (m[2], m[3]))
+        self.monitors = [ self.Monitor(i, *m) for (i, m) in enumerate(monitors) ]
+        self.connected = connected
+        width = max([ m.x + m.width for m in self.monitors ] or [ self.screen.width ])
+        height = max([ m.y + m.height for m in self.monitors ] or [ self.screen.height ])
+        self.screen = self.knox.Geometry(0, 0, width, height)
+        print("Monitors: %s" % ", ".join(
+            "%s %dx%d+%d+%d%s" % (m.name, m.width, m.height, m.x, m.y,
+                                  " primary" if m.primary else "")
+            for m in self.monitors))
+
+    def changed(self, e):
+        self.refresh()
+        return False
+
+    def __len__(self):
+        return len(self.monitors)
+
+    def __iter__(self):
+        return iter(self.monitors)
+
+    def __getitem__(self, i):
+        return self.monitors[i]
+
+    @property
+    def primary(self):
+        for m in self.monitors:
+            if m.primary:
+                return m
+        return self.monitors[0] if self.monitors else None
+
+    def at(self, x, y):
+        """Monitor showing the point, or the nearest one"""
+        def distance(m):
+            dx = max(m.x - x, 0, x - (m.x + m.width - 1))
+            dy = max(m.y - y, 0, y - (m.y + m.height - 1))
+            return dx * dx + dy * dy
+        if not self.monitors:
+            return None
+        return min(self.monitors, key=distance)
+
+    def find(self, s, current=None):
+        """Monitor by index, output name, 'primary', or next/prev relative
+        to current"""
+        if not self.monitors:
+            return None
+        if s == 'primary':
+            return self.primary
+        if s in ('next', 'prev') and current is not None:
+            step = 1 if s == 'next' else -1
+            return self.monitors[(current.index + step) % len(self.monitors)]
+        if s.isdigit():
+            i = int(s)
+            return self.monitors[i] if i < len(self.monitors) else None
+        for m in self.monitors:
+            if m.name == s:
+                return m
+        return None
+
+
+class ClientIndex:
+    """Maps windows to the toplevel client window they are in, so the
+    focused window can be looked up without walking the tree. Children
+    created in, reparented into or destroyed in the clients and the root
+    are followed by the events of SubstructureNotifyMask; deeper ones are
+    found by walking up once, and remembered."""
+    def __init__(self, knox):
+        self.knox = knox
+        self.root_id = knox.root.id
+        self.clients = set()
+        # window id -> client window id
+        self.client = dict()
+        # client window id -> set of window ids mapped to it
+        self.members = dict()
+        self.walks = 0
+        knox.add_event_handler(X.CreateNotify, self.create_notify)
+        knox.add_event_handler(X.ReparentNotify, self.reparent_notify)
+        knox.add_event_handler(X.DestroyNotify, self.destroy_notify)
+
+    def update_clients(self, clients):
+        for win_id in self.clients - clients:
+            self.forget_client(win_id)
+        self.clients = clients
+
+    def add(self, win_id, client_id):
+        self.client[win_id] = client_id
+        self.members.setdefault(client_id, set()).add(win_id)
+
+    def forget(self, win_id):
+        client_id = self.client.pop(win_id, None)
+        if client_id is not None:
+            self.members.get(client_id, set()).discard(win_id)
+
+    def forget_client(self, client_id):
+        for win_id in self.members.pop(client_id, ()):
+            self.client.pop(win_id, None)
+
+    def lookup(self, win_id):
+        if win_id in self.clients:
+            return win_id
+        client_id = self.client.get(win_id)
+        if client_id in self.clients:
+            return client_id
+        return None
+
+    def client_of(self, window):
+        """Client window id of the window, or None if it's not in any"""
+        win_id = self.knox.window_id(window)
+        client_id = self.lookup(win_id)
+        if client_id is not None:
+            return client_id
+        # not seen yet, walk up to a window which is known
+        self.walks += 1
+        path = []
+        window = self.knox.get_window(window)
+        while window and window.id != self.root_id:
+            client_id = self.lookup(window.id)
+            if client_id is not None:
+                break
+            path.append(window.id)
+            try:
+                window = window.query_tree().parent
+            except error.BadWindow:
+                return None
+        if client_id is not None:
+            for w in path:
+                self.add(w, client_id)
+        return client_id
+
+    def create_notify(self, e):
+        client_id = self.lookup(e.parent.id)
+        if client_id is not None:
+            self.add(e.window.id, client_id)
+        return False
+
+    def reparent_notify(self, e):
+        win_id = e.window.id
+        if win_id in self.client:
+            # its children may have moved with it
+            self.forget_client(self.client[win_id])
+        client_id = self.lookup(e.parent.id)
+        if client_id is not None and win_id not in self.clients:
+            self.add(win_id, client_id)
+        return False
+
+    def destroy_notify(self, e):
+        self.forget(e.window.id)
+        return False
+
+
+class PropertyCache:
+    """Copy of the EWMH properties of the root window and the client windows
+    which are read again and again. PropertyNotify events keep it current:
+    a changed property is requested again right away, and the reply is
+    read when it's needed. The events are handled by KnoX.next_event, which
+    the listener calls from the event loop."""
+    root_properties = ("_NET_CLIENT_LIST", "_NET_ACTIVE_WINDOW",
+                       "_NET_CURRENT_DESKTOP", "_NET_WORKAREA")
+    client_properties = (Xatom.WM_NAME, Xatom.WM_CLASS, "_NET_WM_PID",
+                         "_NET_WM_DESKTOP", "_NET_WM_WINDOW_TYPE")
+
+    def __init__(self, knox):
+        self.knox = knox
+        self.root_id = knox.root.id
+        self.root_atoms = self.atoms(self.root_properties)
+        self.client_atoms = self.atoms(self.client_properties)
+        self.client_list = knox.atom("_NET_CLIENT_LIST", only_if_exists=True)
+        # (window id, atom) -> PropCookie, or its reply once it's read
+        self.values = dict()
+        self.clients = set()
+        self.client_index = ClientIndex(knox)
+        self.hits = 0
+        self.misses = 0
+        knox.select_events(knox.root,
+                           X.PropertyChangeMask | X.SubstructureNotifyMask)
+        knox.add_event_handler(X.PropertyNotify, self.property_notify)
+        for atom in self.root_atoms:
+            self.request(self.root_id, atom)
+        self.update_clients()
+
+    def atoms(self, names):
+        atoms = set()
+        for name in names:
+            atom = self.knox.atom(name, only_if_exists=True)
+            if atom:
+                atoms.add(atom)
+        return atoms
+
+    def tracks(self, win_id, atom):
+        if win_id == self.root_id:
+            return atom in self.root_atoms
+        return win_id in self.clients and atom in self.client_atoms
+
+    def request(self, win_id, atom):
+        self.values[(win_id, atom)] = self.knox.prop_request(
+            win_id, atom, cached=False)
+
+    def get(self, win_id, atom):
+        """The reply of a tracked property, like prop_reply gives it"""
+        # changes which came in meanwhile
+        self.knox.dispatch_pending()
+        k = (win_id, atom)
+        if k not in self.values:
+            self.misses += 1
+            self.request(win_id, atom)
+        v = self.values[k]
+        if isinstance(v, KnoX.PropCookie):
+            v = self.knox.prop_reply(v)
+            self.values[k] = v
+        else:
+            self.hits += 1
+        return v
+
+    def ignore_error(self, *args, **kwargs):
+        # window went away before it could be watched
+        pass
+
+    def update_clients(self):
+        if not self.client_list:
+            return
+        clients = set(self.knox.reply_value(
+            self.get(self.root_id, self.client_list)) or ())
+        for win_id in self.clients - clients:
+            for atom in self.client_atoms:
+                self.values.pop((win_id, atom), None)
+            self.knox.event_masks.pop(win_id, None)
+        for win_id in clients - self.clients:
+            # children of it are followed by the client index
+            self.knox.select_events(
+                win_id, X.PropertyChangeMask | X.SubstructureNotifyMask,
+                onerror=self.ignore_error)
+            for atom in self.client_atoms:
+                self.request(win_id, atom)
+        self.clients = clients
+        self.client_index.update_clients(clients)
+
+    def property_notify(self, e):
+        win_id = e.window.id
+        if not self.tracks(win_id, e.atom):
+            return False
+        if e.state == X.PropertyDelete:
+            self.values[(win_id, e.atom)] = None
+        else:
+            self.request(win_id, e.atom)
+        if win_id == self.root_id and e.atom == self.client_list:
+            self.update_clients()
+        return True
+
+    def stats(self):
+        return ("%d clients, %d properties cached, %d hits, %d misses,"
+                " %d windows indexed in %d walks"
+                % (len(self.clients), len(self.values), self.hits, self.misses,
+                   len(self.client_index.client), self.client_index.walks))
+
+
 import traceback
 
 class KnoX:
     Geometry = namedtuple("Geometry", "x y width height")
+    PropCookie = namedtuple("PropCookie", "window property request")
+
+    # display name -> (name -> atom, atom -> name), shared by the KnoX
+    # objects on the same display, atoms don't change while it runs
+    atom_caches = dict()
+    # interned all at once when connecting
+    known_atoms = (
+        [ "UTF8_STRING", "_MOTIF_WM_HINTS" ]
+        + [ "_NET_%s" % name for name in (
+            "SUPPORTED", "CLIENT_LIST", "ACTIVE_WINDOW", "CURRENT_DESKTOP",
+            "WORKAREA", "SHOWING_DESKTOP", "CLOSE_WINDOW", "FRAME_EXTENTS",
+            "WM_PID", "WM_DESKTOP", "WM_STATE", "WM_WINDOW_TYPE",
+            "WM_WINDOW_OPACITY") ]
+        + [ "_NET_WM_STATE_%s" % name for name in (
+            "MODAL", "STICKY", "MAXIMIZED_VERT", "MAXIMIZED_HORZ", "SHADED",
+            "SKIP_TASKBAR", "SKIP_PAGER", "HIDDEN", "FULLSCREEN", "ABOVE",
+            "BELOW", "DEMANDS_ATTENTION") ]
+        + [ "_NET_WM_WINDOW_TYPE_%s" % name for name in (
+            "DESKTOP", "DOCK", "TOOLBAR", "MENU", "UTILITY", "SPLASH",
+            "DIALOG", "DROPDOWN_MENU", "POPUP_MENU", "TOOLTIP",
+            "NOTIFICATION", "COMBO", "DND", "NORMAL") ])
     FrameExtents = namedtuple("FrameExtents", "left right top bottom")
 
     def __init__(self):
@@ -307,10 +988,30 @@ class KnoX:
         self.display.set_error_handler(self.knox_error_handler)
         self.screen = self.display.screen()
         self.root = self.screen.root
-        self.atoms = dict()
-        self.atom_names = dict()
+        (self.atoms, self.atom_names) = self.atom_caches.setdefault(
+            self.display.get_display_name(), (dict(), dict()))
+        self.intern_atoms(self.known_atoms)
         self.keysyms = Keysyms()
-        self.modifiers = Modifiers(self)
+        self.modifiers = ModifierMap(self)
+        self.key_grabs = KeyGrabs(self)
+        # changes when the keyboard mapping does
+        self.keymap_serial = 0
+        # called with the set of changed keycodes and whether the modifier
+        # mapping changed
+        self.keymap_listeners = list()
+        # event type -> functions returning True if they consumed the event
+        self.event_handlers = dict()
+        self.add_event_handler(X.MappingNotify, self.mapping_notify)
+        self._overlay = None
+        self._monitors = None
+        self._key_injector = None
+        # events read meanwhile which weren't consumed by the handlers
+        self.held_events = collections.deque()
+        self._dispatching = False
+        # see enable_property_cache
+        self.property_cache = None
+        # window id -> event mask selected by us
+        self.event_masks = dict()
         self._supported_properties = None
         self._acceptable_error_sequence = 0
         self._acceptable_errors = dict()
@@ -320,6 +1021,25 @@ class KnoX:
         """This function is here to make select work with this object"""
         return self.display.fileno()
 
+    @property
+    def monitors(self):
+        """The Monitors, read on first use and kept current by events"""
+        if self._monitors is None:
+            self._monitors = Monitors(self)
+        return self._monitors
+
+    @property
+    def key_injector(self):
+        if self._key_injector is None:
+            self._key_injector = KeyInjector(self)
+        return self._key_injector
+
+    @property
+    def overlay(self):
+        if self._overlay is None:
+            self._overlay = Overlay(self)
+        return self._overlay
+
     @contextmanager
     def silenced_error(self, error):
         silencer = self.silence_error(error)
@@ -358,22 +1078,151 @@ class KnoX:
     #     return len(rlist) > 0
 
     def next_event(self, wait=True):
-        if (wait or self.display.pending_events()):
-            return self.display.next_event()
+        """Events consumed by the handlers added with add_event_handler are
+        not returned"""
+        if self.held_events:
+            return self.held_events.popleft()
+        while (wait or self.display.pending_events()):
+            e = self.display.next_event()
+            if not self.handle_event(e):
+                return e
+        return None
+
+    def pending(self):
+        """True when events have been read from the connection already, so
+        select won't tell about them. See EventLoop.buffered."""
+        return bool(self.held_events or self.display.display.event_queue)
+
+    def dispatch_pending(self):
+        """Let the handlers see the events which came in so far, the rest are
+        kept for next_event"""
+        if self._dispatching:
+            # a handler reading the cache
+            return
+        self._dispatching = True
+        try:
+            while self.display.pending_events():
+                e = self.display.next_event()
+                if not self.handle_event(e):
+                    self.held_events.append(e)
+        finally:
+            self._dispatching = False
+
+    def enable_property_cache(self):
+        """Keep a copy of the frequently read properties, see PropertyCache.
+        Somebody has to call next_event for it to stay up to date."""
+        if self.property_cache is None:
+            self.property_cache = PropertyCache(self)
+            self.flush()
+
+    def add_event_handler(self, event_type, handler):
+        self.event_handlers.setdefault(event_type, []).append(handler)
+
+    def remove_event_handler(self, event_type, handler):
+        handlers = self.event_handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def handle_event(self, e):
+        consumed = False
+        dispatching = self._dispatching
+        # handlers reading the cache shouldn't handle the next events yet
+        self._dispatching = True
+        try:
+            for handler in list(self.event_handlers.get(e.type, ())):
+                if handler(e):
+                    consumed = True
+        finally:
+            self._dispatching = dispatching
+        return consumed
+
+    def select_events(self, window, mask, onerror=None):
+        """Add to the events selected on the window"""
+        win_id = self.window_id(window)
+        old = self.event_masks.get(win_id, 0)
+        if old | mask != old:
+            self.event_masks[win_id] = old | mask
+            self.get_window(window).change_attributes(
+                event_mask=old | mask, onerror=onerror)
+
+    def property_completion(self, window, name, test, timeout=None):
+        """Completion done when test(value) is true for the property, which
+        is checked on the PropertyNotify events of it"""
+        window = self.get_window(window)
+        atom = self.atom(name)
+        def check(e):
+            if e.window.id == window.id and e.atom == atom:
+                return test(self.get_prop(window, atom))
+            return False
+        self.select_events(window, X.PropertyChangeMask,
+                           onerror=self.completion_error)
+        return Completion(self, (X.PropertyNotify,), check, timeout)
+
+    def completion_error(self, *args, **kwargs):
+        print("Cannot wait for window: %r %r" % (args, kwargs))
+
+    def mapping_notify(self, e):
+        """Keep the keyboard and modifier mapping caches up to date. Only the
+        keycodes in the event are asked for again."""
+        changed = set()
+        modifiers_changed = False
+        if e.request == X.MappingKeyboard:
+            keycodes = range(e.first_keycode, e.first_keycode + e.count)
+            before = [ self.keycode_levels(keycode) for keycode in keycodes ]
+            self.display.refresh_keyboard_mapping(e)
+            for (keycode, keysyms) in zip(keycodes, before):
+                if self.keycode_levels(keycode) != keysyms:
+                    changed.add(keycode)
+        elif e.request == X.MappingModifier:
+            modifiers = ModifierMap(self)
+            if modifiers.bit_names() != self.modifiers.bit_names():
+                self.modifiers = modifiers
+                modifiers_changed = True
+            else:
+                # same bits, the parsed keys and the grabs are still right,
+                # only the modifier keys may have moved
+                if modifiers.keycodes != self.modifiers.keycodes:
+                    self.modifiers.keycodes = modifiers.keycodes
+                    if self._key_injector is not None:
+                        self._key_injector.sequences.clear()
         else:
-            return None
+            # pointer buttons, nothing to do with us
+            return True
+        print("Keyboard mapping changed: %d keycodes%s"
+              % (len(changed), ", modifiers" if modifiers_changed else ""))
+        if changed or modifiers_changed:
+            self.keymap_serial += 1
+            for listener in list(self.keymap_listeners):
+                listener(changed, modifiers_changed)
+        return True
 
     # def next_event(self, event_loop):
     #     event_loop.register_reader(self.display,
 
 
 
+    def intern_atoms(self, names):
+        """Interns the atoms which are not known yet, sending all requests
+        before reading any reply"""
+        cookies = [
+            (name, protocol.request.InternAtom(
+                display=self.display.display, defer=True,
+                name=name, only_if_exists=False))
+            for name in names if name not in self.atoms ]
+        for (name, cookie) in cookies:
+            cookie.reply()
+            self.atoms[name] = cookie.atom
+            self.atom_names[cookie.atom] = name
+
     def atom(self, name, only_if_exists=False):
         if isinstance(name, int):
             a = name
         elif name not in self.atoms:
             a = self.display.get_atom(name, only_if_exists=only_if_exists)
-            self.atoms[name] = a
+            if a:
+                # not remembered if it doesn't exist, yet
+                self.atoms[name] = a
+                self.atom_names[a] = name
         else:
             a = self.atoms[name]
         return a
@@ -395,6 +1244,10 @@ class KnoX:
             return None
         if isinstance(window, int):
             window = self.get_window(window)
+        if (self.property_cache is not None
+            and self.property_cache.tracks(window.id, prop_name)):
+            return self.reply_value(
+                self.property_cache.get(window.id, prop_name))
         p = window.get_full_property(prop_name, X.AnyPropertyType)
         if p:
             return p.value
@@ -403,6 +1256,10 @@ class KnoX:
         prop_name = self.atom(name, only_if_exists=True)
         if not prop_name:
             return None
+        if (self.property_cache is not None
+            and self.property_cache.tracks(window.id, prop_name)):
+            return self.reply_text(
+                self.property_cache.get(window.id, prop_name))
         s = window.get_full_text_property(prop_name, Xatom.STRING)
         if not s:
             t = self.atom("UTF8_STRING", only_if_exists=True)
@@ -449,22 +1306,24 @@ class KnoX:
             propagate=False, onerror=self.onerror)
 
     def current_desktop(self, desktop=None, wait=True):
+        """Without desktop returns the current one. Otherwise switches to it
+        and returns a Completion, done when the switch took effect or after
+        wait seconds."""
         prop_name = "_NET_CURRENT_DESKTOP"
         if desktop is None:
             pv = self.get_prop(self.root, prop_name)
             if pv:
                 return pv[0]
         else:
-            v = array('I', [ desktop ])
+            if self.current_desktop() == desktop:
+                return Completion.finished(self)
+            done = self.property_completion(
+                self.root, prop_name,
+                lambda pv: bool(pv) and pv[0] == desktop, timeout=wait)
             #self.set_prop(self.root, prop_name, Xatom.CARDINAL, v)
             self.send_prop_change_event(prop_name, (32, [ desktop, X.CurrentTime, 0, 0, 0 ]))
             self.flush()
-            w = Waiter(wait)
-            while w.wait():
-                print("DESKTOPCHECK", hex(desktop))
-                if self.current_desktop() == desktop:
-                    print("DESKTOP OK")
-                    break
+            return done
 
 
     def get_wm_pid(self, window):
@@ -482,12 +1341,15 @@ class KnoX:
 
 
     def active_window(self, window=None, wait=3, id_only=False):
+        """Without window returns the active one. Otherwise activates it and
+        returns a Completion, done when it became the active window or
+        after wait seconds."""
         prop_name = "_NET_ACTIVE_WINDOW"
         if window is None:
             pv = self.get_prop(self.root, prop_name)
             if pv and pv[0]:
                 window = self.get_window(pv[0])
-                if window and window.get_wm_name() != 'Desktop':
+                if window and self.get_wm_name(window) != 'Desktop':
                     if id_only:
                         return window.id
                     else:
@@ -495,37 +1357,43 @@ class KnoX:
         else:
             if isinstance(window, int):
                 window = self.get_window(window)
-            desktop = self.get_desktop_for_window(window)
-            self.current_desktop(desktop)
-            #v = array('I', [ window.id, 0 ])
-            #self.set_prop(self.root, prop_name, Xatom.WINDOW, v)
-            # data[0]: source indication
-            #   1: when the request comes from an application
-            #   2: from a pager
-            #   0: no spec.
-            self.send_prop_change_event(prop_name,
-                                        (32, [2, X.CurrentTime, 0, 0, 0]),
-                                        window=window)
-            self.flush()
-            #self.raise_window(window)
-            # it won't become active until it's focused
-            focused = self.set_focused_window(window, wait=1)
-            w = Waiter(wait)
-            while w.wait():
-                a = self.active_window()
-                self.flush()
-                if not focused:
-                    focused = self.set_focused_window(window, wait=1)
-                    self.flush()
-                if a and a.id == window.id:
-                    print("Activated %r!"% window.id)
-                    return True
+            done = self.property_completion(
+                self.root, prop_name,
+                lambda pv: bool(pv) and pv[0] == window.id, timeout=wait)
+            def send():
+                #v = array('I', [ window.id, 0 ])
+                #self.set_prop(self.root, prop_name, Xatom.WINDOW, v)
+                # data[0]: source indication
+                #   1: when the request comes from an application
+                #   2: from a pager
+                #   0: no spec.
                 self.send_prop_change_event(prop_name,
                                             (32, [2, X.CurrentTime, 0, 0, 0]),
                                             window=window)
+                # it won't become active until it's focused
+                self.display.set_input_focus(window, X.RevertToParent,
+                                             X.CurrentTime,
+                                             onerror=self.focus_error)
+            def activate():
+                send()
                 self.flush()
-            print("Can't activate %d" % window.id)
-            return False
+                done.repeat(send)
+            desktop = self.get_desktop_for_window(window)
+            if desktop is None or desktop == 0xFFFFFFFF:
+                # sticky
+                activate()
+            else:
+                # focus can be set only once it's on the screen
+                switched = self.current_desktop(desktop, wait=wait)
+                switched.add_done_callback(
+                    lambda c: done.done or activate())
+                # it times out with done, which is the one attached or
+                # waited on, its event handler isn't left behind
+                done.add_done_callback(lambda c: switched.finish(False))
+            done.add_done_callback(
+                lambda c: print("Activated %r!" % window.id if c.result
+                                else "Can't activate %d" % window.id))
+            return done
 
 
     def get_focused_window(self, toplevel=True):
@@ -552,39 +1420,32 @@ class KnoX:
         print("Cannot set_input_focus: %r %r" % (args, kwargs))
 
     def set_focused_window(self, window, wait=3):
+        """Returns a Completion, done when the window got the focus, or
+        after wait seconds"""
         if window is None:
             self.display.set_input_focus(X.NONE, X.RevertToParent, X.CurrentTime,
                                          onerror=self.focus_error)
-            return True
-        elif not wait:
-            self.display.set_input_focus(window, X.RevertToParent, X.CurrentTime)
-            return True
-        else:
-            with self.silenced_error(error.BadMatch):
-                if isinstance(window, int):
-                    window = self.get_window(window)
-                self.display.set_input_focus(window, X.RevertToParent, X.CurrentTime)
-                self.flush()
-                w = Waiter(wait)
-                while w.wait():
-                    if w.timeout:
-                        if w.progressed:
-                            print("WAITING %.3f seconds more for focus on %r"
-                                  % (w.remaining, window.id))
-                        else:
-                            print("READY TO WAIT %.3f seconds for focus on %r"
-                                  % (w.remaining, window.id))
-                    focused_win_id = self.get_focused_window()
-                    if focused_win_id == window.id:
-                        print("FOCUSED %r" % window.id)
-                        return True
-                    # many times it's needed to repeat the command, esp. when mouse is
-                    # not inside the target window
-                    self.display.set_input_focus(window, X.RevertToParent, X.CurrentTime)
-                    self.flush()
-                    #self.display.set_input_focus(window, X.RevertToParent, X.CurrentTime)
-                    #self.display.flush()
-            return False
+            return Completion.finished(self)
+        window = self.get_window(window)
+        if not wait:
+            self.display.set_input_focus(window, X.RevertToParent, X.CurrentTime,
+                                         onerror=self.focus_error)
+            return Completion.finished(self)
+        if self.get_focused_window(toplevel=False) == window.id:
+            return Completion.finished(self)
+        def check(e):
+            # focus went to the window or into one of its children
+            return e.window.id == window.id and e.mode != X.NotifyGrab
+        self.select_events(window, X.FocusChangeMask,
+                           onerror=self.completion_error)
+        done = Completion(self, (X.FocusIn,), check, wait)
+        def focus():
+            self.display.set_input_focus(window, X.RevertToParent, X.CurrentTime,
+                                         onerror=self.focus_error)
+        focus()
+        self.flush()
+        done.repeat(focus)
+        return done
 
 
     def get_desktop_for_window(self, window):
@@ -600,23 +1461,140 @@ class KnoX:
             pv = self.set_prop(window, name, Xatom.CARDINAL, array('I', [ desktop ]))
 
     def save_state(self):
+        """Snapshot of the desktop and focus. The queries are all sent before
+        any reply is read, so it costs one round trip, two when the focus is
+        not on a client window or the name of the active window is needed."""
+        desktop = self.prop_request(self.root, "_NET_CURRENT_DESKTOP")
+        active = self.prop_request(self.root, "_NET_ACTIVE_WINDOW")
+        clients = self.prop_request(self.root, "_NET_CLIENT_LIST")
+        focus = protocol.request.GetInputFocus(display=self.display.display,
+                                               defer=True)
+        focus.reply()
+        desktop = self.prop_value(desktop)
+        active = self.prop_value(active)
+        clients = set(self.prop_value(clients) or ())
+        active = active[0] if active else None
+        if active:
+            name = self.prop_request(active, Xatom.WM_NAME)
+        focused = focus.focus
+        if focused in (X.NONE, X.PointerRoot):
+            focused = None
+        elif focused.id in clients:
+            focused = focused.id
+        else:
+            focused = self.get_client_window(focused, clients=clients or None)
+            focused = focused.id if focused is not None else focus.focus.id
+        if active and self.text_prop_value(name) == 'Desktop':
+            active = None
         state = {
-            "Current Desktop": self.current_desktop(),
-            "Active Window":   self.active_window(id_only=True),
-            "Focused Window":  self.get_focused_window()
+            "Current Desktop": desktop[0] if desktop else None,
+            "Active Window":   active,
+            "Focused Window":  focused
         }
         return state
 
     def restore_state(self, state):
-        a = self.supported_properties
-        self.current_desktop(state["Current Desktop"])
+        """Sends what's needed to get back to the saved state without waiting
+        for the window manager to do it"""
+        desktop = state["Current Desktop"]
+        if desktop is not None and desktop != self.current_desktop():
+            self.send_prop_change_event(
+                "_NET_CURRENT_DESKTOP", (32, [ desktop, X.CurrentTime, 0, 0, 0 ]))
+        focused = state["Focused Window"]
+        if focused is not None:
+            self.display.set_input_focus(self.get_window(focused),
+                                         X.RevertToParent, X.CurrentTime,
+                                         onerror=self.focus_error)
         self.flush()
-        try:
-            self.set_focused_window(state["Focused Window"])
-        except error.BadWindow:
-            print("Sorry, the old focused window went away...")
         # self.active_window(state["Active Window"])
 
+    # long_length of the property requests, in 32 bit units
+    prop_request_length = 1 << 16
+
+    def prop_request(self, window, name, cached=True):
+        """Sends a GetProperty request without waiting for the reply, which is
+        read by prop_value or text_prop_value. Returns None when there's
+        no such property. Properties in the property cache aren't
+        requested, their replies come from there."""
+        prop_name = self.atom(name, only_if_exists=True)
+        if not prop_name:
+            return None
+        window = self.get_window(window)
+        if (cached and self.property_cache is not None
+            and self.property_cache.tracks(window.id, prop_name)):
+            return self.PropCookie(window, prop_name, None)
+        return self.PropCookie(window, prop_name, protocol.request.GetProperty(
+            display=self.display.display, defer=True,
+            delete=False, window=window, property=prop_name,
+            type=X.AnyPropertyType,
+            long_offset=0, long_length=self.prop_request_length))
+
+    def prop_reply(self, cookie):
+        """(format, type, value) of a property requested by prop_request, or
+        None if it's not there"""
+        if cookie is None:
+            return None
+        r = cookie.request
+        if r is None:
+            return self.property_cache.get(cookie.window.id, cookie.property)
+        try:
+            r.reply()
+        except error.XError:
+            # window went away
+            return None
+        if not r.property_type:
+            return None
+        (fmt, value) = r.value
+        if r.bytes_after:
+            # longer than asked for, rare enough to ask again
+            p = cookie.window.get_full_property(cookie.property,
+                                                X.AnyPropertyType)
+            if p is None:
+                return None
+            (fmt, value) = (p.format, p.value)
+        return (fmt, r.property_type, value)
+
+    def prop_value(self, cookie):
+        """Same as get_prop, for a property requested by prop_request"""
+        return self.reply_value(self.prop_reply(cookie))
+
+    def text_prop_value(self, cookie):
+        """Same as get_text_prop, for a property requested by prop_request"""
+        return self.reply_text(self.prop_reply(cookie))
+
+    def get_props(self, pairs):
+        """Reads the properties of many (window, name) pairs. All requests
+        are sent before any reply is read, so it costs about one round trip.
+        Returns a dict from (window id, name) to what prop_reply gives, to be
+        read with reply_value, reply_text or reply_wm_class."""
+        cookies = [ (self.window_id(window), name, self.prop_request(window, name))
+                    for (window, name) in pairs ]
+        return { (win_id, name): self.prop_reply(cookie)
+                 for (win_id, name, cookie) in cookies }
+
+    def reply_value(self, reply):
+        if reply:
+            return reply[2]
+
+    def reply_text(self, reply):
+        if not reply or reply[0] != 8:
+            return None
+        (_, prop_type, value) = reply
+        if prop_type == Xatom.STRING:
+            return value.decode('latin-1')
+        elif prop_type == self.atom("UTF8_STRING", only_if_exists=True):
+            return value.decode('utf-8', errors='replace')
+        return None
+
+    def reply_wm_class(self, reply):
+        """(instance, class) like Window.get_wm_class"""
+        s = self.reply_text(reply)
+        if s is None:
+            return None
+        parts = s.split('\0')
+        if len(parts) < 2:
+            return None
+        return (parts[0], parts[1])
 
     def keysym_to_string(self, keysym, friendly=False, very_friendly=False):
         if keysym not in self.keysyms.keysyms:
@@ -637,11 +1615,20 @@ class KnoX:
                     syms.add(keysym)
             return syms
         else:
-            return self.display.keycode_to_keysym(event.detail, i)
+            return self.display.keycode_to_keysym(keycode, idx)
+
+    def keycode_levels(self, keycode):
+        """Keysym of each level of the key, NoSymbol where there's none"""
+        return tuple(self.display.keycode_to_keysym(keycode, i) for i in range(8))
 
     def keysym_to_keycode(self, keysym):
         return self.display.keysym_to_keycode(keysym)
 
+    @property
+    def keycode_range(self):
+        info = self.display.display.info
+        return (info.min_keycode, info.max_keycode)
+
     def string_to_keysym(self, s):
         k = self.keysyms[s]
         if not k:
@@ -661,7 +1648,8 @@ class KnoX:
 
 
     def toggle_frame(self, window, frame=None, wait=1):
-        """Set window frame. Value should be True or False for on and off, or None for toggle."""
+        """Set window frame. Value should be True or False for on and off, or None for toggle.
+        Returns a Completion, done when the frame extents changed."""
         # flags - set bit for every iteresting value
         # 0 functions   => integer bits
         # 1 decorations => integer bits
@@ -718,17 +1706,14 @@ class KnoX:
             # reasonable default
             hints = array('I', [ 2, 0, 0, 0, 0 ])
 
+        # the window manager changes the frame extents once it's done
+        done = self.property_completion(
+            window, "_NET_FRAME_EXTENTS",
+            lambda e: self.FrameExtents(*e) != fe if e else fe != (0, 0, 0, 0),
+            timeout=wait)
         self.set_prop(window, name, name, hints)
-
-        w = Waiter(wait)
-        while w.wait():
-            pv = self.get_prop(window, name)
-            if pv and array(pv.typecode, pv) == hints:
-                new_fe = self.get_frame_extents(window)
-                # make sure frame extents changed
-                # this seems to take a while once the hints change
-                if new_fe != fe:
-                    break
+        self.flush()
+        return done
 
 
     def set_opacity(self, window, value):
@@ -750,6 +1735,11 @@ class KnoX:
         return self._supported_properties
 
 
+    def window_id(self, window):
+        if isinstance(window, int):
+            return window
+        return window.id
+
     def get_window(self, win_id):
         if isinstance(win_id, int):
             return self.display.create_resource_object('window', win_id)
@@ -757,15 +1747,26 @@ class KnoX:
             return win_id
 
 
-    def get_client_window(self, window):
-        win_id = window.id
-        for tlw in self.toplevel_windows():
-            for (_, parent, _) in self.window_tree(
-                    tlw, filter=lambda w, parent, level: w.id == win_id):
-                return tlw
+    def get_client_window(self, window, clients=None):
+        """The toplevel client window containing window, found by walking
+        up from it, or in the client index of the property cache"""
+        if self.property_cache is not None:
+            client_id = self.property_cache.client_index.client_of(window)
+            if client_id is not None:
+                return self.get_window(client_id)
+            return None
+        if clients is None:
+            clients = set(self.toplevel_windows(id_only=True) or ())
+        window = self.get_window(window)
+        while window and window.id != self.root.id:
+            if window.id in clients:
+                return window
+            try:
+                window = window.query_tree().parent
+            except error.BadWindow:
+                return None
         return None
 
-
     def toplevel_windows(self, id_only=False):
         name = self.atom("_NET_CLIENT_LIST", only_if_exists=True)
         if name in self.supported_properties:
@@ -782,15 +1783,40 @@ class KnoX:
                 return list(self.root.query_tree().children)
 
 
-    def window_tree(self, parent=None, level=1, filter=None):
+    def window_tree(self, parent=None, level=1, filter=None, max_depth=None,
+                    prune=None):
+        """(window, parent, level) for the windows below parent, level by
+        level. The QueryTree requests of a whole level are sent before
+        reading any reply, so it takes a round trip for each level, not for
+        each window. Windows for which filter(window, parent, level) is
+        false are left out with everything below them, the ones for which
+        prune is true are yielded but not looked into. Nothing is asked
+        below max_depth."""
         if parent is None:
             parent = self.root
             if filter is None or filter(parent, None, 0):
                 yield (parent, None, 0)
-        for w in parent.query_tree().children:
-            if filter is None or filter(w, parent, level):
-                yield (w, parent, level)
-                yield from self.window_tree(parent=w, level=level+1, filter=filter)
+            else:
+                return
+        display = self.display.display
+        windows = [ parent ]
+        while windows and (max_depth is None or level <= max_depth):
+            cookies = [ (w, protocol.request.QueryTree(
+                display=display, defer=True, window=w)) for w in windows ]
+            windows = []
+            for (p, cookie) in cookies:
+                try:
+                    cookie.reply()
+                    children = cookie.children
+                except error.BadWindow:
+                    # gone since its parent was asked
+                    continue
+                for w in children:
+                    if filter is None or filter(w, p, level):
+                        yield (w, p, level)
+                        if prune is None or not prune(w, p, level):
+                            windows.append(w)
+            level += 1
 
 
     def close_window(self, window):
@@ -877,7 +1903,11 @@ class KnoX:
         return window.get_attributes()
 
     def get_window_type(self, window):
-        e = self.get_prop(window, "_NET_WM_WINDOW_TYPE")
+        return self.window_type_names(
+            self.get_prop(window, "_NET_WM_WINDOW_TYPE"))
+
+    def window_type_names(self, e):
+        """Names of the _NET_WM_WINDOW_TYPE atoms, without the prefix"""
         if e is None:
             return None
         type_details = set()
@@ -926,18 +1956,53 @@ class KnoX:
                 data['y'] += wa.y
         window.configure(**data)
 
-    def usable_workarea(self):
+    def usable_workarea(self, monitor=None):
+        """Workarea of the current desktop, or its part on the monitor"""
         a = self.get_prop(self.root, "_NET_WORKAREA")
         if a:
             p = self.current_desktop() * 4
             #return (x, y, width, height)
-            return self.Geometry(*a[p:p+4])
+            wa = self.Geometry(*a[p:p+4])
         else:
-            r = self.get_geometry(self.root)
-            return self.Geometry(0, 0, r.width, r.height)
-
+            wa = self.monitors.screen
+        if monitor is None:
+            return wa
+        # the workarea spans all monitors, struts of the panels are taken
+        # off of it already
+        x = max(wa.x, monitor.x)
+        y = max(wa.y, monitor.y)
+        right = min(wa.x + wa.width, monitor.x + monitor.width)
+        bottom = min(wa.y + wa.height, monitor.y + monitor.height)
+        if right <= x or bottom <= y:
+            return self.Geometry(monitor.x, monitor.y, monitor.width, monitor.height)
+        return self.Geometry(x, y, right - x, bottom - y)
+
+    def place_windows(self, placements):
+        """Moves and resizes many windows, (window, Geometry) pairs with the
+        geometry meant for the frame. The frame extents are read together,
+        the requests are not flushed."""
+        placements = [ (self.get_window(w), g) for (w, g) in placements ]
+        props = self.get_props((w, "_NET_FRAME_EXTENTS") for (w, _) in placements)
+        for (window, g) in placements:
+            e = self.reply_value(props[(window.id, "_NET_FRAME_EXTENTS")])
+            f = self.FrameExtents(*e) if e else self.FrameExtents(0, 0, 0, 0)
+            # a maximized window wouldn't move
+            self.set_wm_states(window, ("maximized_horz", "maximized_vert"),
+                               action=False)
+            window.configure(x=g.x, y=g.y,
+                             width=max(g.width - f.left - f.right, 1),
+                             height=max(g.height - f.top - f.bottom, 1))
+
+    def monitor_of(self, window):
+        """The monitor showing the middle of the window"""
+        window = self.get_window(window)
+        g = window.get_geometry()
+        t = window.translate_coords(self.root, 0, 0)
+        return self.monitors.at(-t.x + g.width // 2, -t.y + g.height // 2)
 
     def send_key(self, window, keysym, modifiers):
+        """modifiers is a Modifiers value or a bitmask"""
+        state = int(modifiers)
         if isinstance(window, int):
             window = self.get_window(window)
         keycode = self.display.keysym_to_keycode(keysym)
@@ -951,7 +2016,7 @@ class KnoX:
             root_y = 0,
             event_x = 0,
             event_y = 0,
-            state = modifiers.bitmap,
+            state = state,
             detail = keycode)
         window.send_event(event, propagate=False)
         event = protocol.event.KeyRelease(
@@ -964,10 +2029,23 @@ class KnoX:
             root_y = 0,
             event_x = 0,
             event_y = 0,
-            state = modifiers.bitmap,
+            state = state,
             detail = keycode)
         window.send_event(event, propagate=False)
 
+    def send_keys(self, window, source, parse):
+        """Types the key sequence of source, see KeyInjector.compile. With
+        XTEST when the window is the active one, since that's where they go,
+        otherwise or when some key can't be typed so, with send_key."""
+        seq = self.key_injector.compile(source, parse)
+        if seq.events is not None and self.window_id(window) == self.active_window(id_only=True):
+            self.key_injector.inject(seq)
+        else:
+            for (keysym, modifiers) in seq.keys:
+                self.send_key(window, keysym,
+                              int(modifiers) | self.key_injector.level_state(keysym))
+        self.flush()
+
     def show_desktop(self, action=None):
         prop_name = self.atom("_NET_SHOWING_DESKTOP")
         if action is True:
@@ -990,11 +2068,5 @@ class KnoX:
 
     @property
     def display_count(self):
-        res = randr.get_screen_resources(self.root)
-        n = 0
-        for i in res.outputs:
-            o = randr.get_output_info(self.root, i, config_timestamp=0)
-            if o.modes:
-                # has modes, empty if there's no monitor connected here
-                n += 1
-        return n
+        """Connected outputs"""
+        return self.monitors.connected
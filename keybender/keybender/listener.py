@@ -2,7 +2,6 @@ import itertools, functools
 from collections import namedtuple
 from Xlib import X, error
 import time
-from keybender.knox import Modifiers
 from keybender.event import Event
 
 class Listener:
@@ -11,40 +10,65 @@ class Listener:
     def __new__(cls, *args, level=1, **kwargs):
         if cls == Listener:
             if level <= 1:
-                return XKeyListener(*args, level=level, **kwargs)
+                cls = XKeyListener
             elif level >= 2:
-                return XListener(*args, level=level, **kwargs)
+                cls = XListener
         return object.__new__(cls)
 
-    def __init__(self, knox, event_loop, triggers, level=1):
-        # event.state & w.mask.modifiers.bitmap == w.trigger.modifiers.bitmap
+    def __init__(self, knox, event_loop, triggers, level=1, timeout=None,
+                 waiter=None, states=None, grab_mode='exact'):
+        # event.state & w.mask.modifiers.bits == w.trigger.modifiers.bits
         # keysym = self.know.display.keycode_to_keysym(event.detail, 0)
         # event.keycode = w.trigger.
         self.knox = knox
         self.event_loop = event_loop
         self.event_map = dict()
         self.level = level
+        self.timeout = timeout
+        self.grab_mode = grab_mode
         self.chained_listeners = dict()
         self.x_state = None
+        # the listener on level 1 drives the whole chord, the others are
+        # just states it steps through
+        self.current = self
+        self.timer_key = None
+        # see build_table
+        self.table = None
+        self.table_serial = None
+        if states is None:
+            # one state per waiter, so waiters can refer to each other
+            states = dict()
+        self.states = states
+        if waiter is not None:
+            states[waiter] = self
         for t in triggers:
             if t.waiter:
-                self.chained_listeners[t] = Listener(
-                    self.knox, event_loop, t.waiter.triggers, level=level+1)
+                if t.waiter not in states:
+                    Listener(self.knox, event_loop, t.waiter.triggers,
+                             level=level+1, timeout=t.waiter.timeout,
+                             waiter=t.waiter, states=states,
+                             grab_mode=grab_mode)
+                self.chained_listeners[t] = states[t.waiter]
 
             # keysym to keycode
             # all bitcombos outside of the mask
-            for (i, pm) in enumerate((~t.mask.modifiers).possible_values()):
-                # print("    %5d: %s :: %s" % (i, "{0:08b}".format(pm.bitmap), pm))
+            if grab_mode == 'any-modifier':
+                # one grab on any modifiers, the state is checked
+                # by find_entry
+                variants = [ self.knox.modifiers.none ]
+            else:
+                variants = (~t.mask.modifiers).possible_values()
+            for (i, pm) in enumerate(variants):
+                # print("    %5d: %s :: %s" % (i, "{0:08b}".format(pm.bits), pm))
                 # print("           Grabkey + %s -> %s with %r" % (
-                #     w.trigger.modifiers, "{0:08b}".format((pm | w.trigger.modifiers).bitmap),
+                #     w.trigger.modifiers, "{0:08b}".format((pm | w.trigger.modifiers).bits),
                 #     w.trigger.keysym))
                 e = self.MapEntry(t.key.keysym,
                                   pm,
-                                  (pm | t.key.modifiers), (pm | t.key.modifiers).bitmap,
-                                  t.mask.modifiers, t.mask.modifiers.bitmap,
-                                  t.key.modifiers, t.key.modifiers.bitmap,
+                                  (pm | t.key.modifiers), (pm | t.key.modifiers).bits,
+                                  t.mask.modifiers, t.mask.modifiers.bits,
+                                  t.key.modifiers, t.key.modifiers.bits,
                                   t)
-                a = Modifiers(self.knox)
                 if e.keysym not in self.event_map:
                     self.event_map[e.keysym] = list()
                 self.event_map[t.key.keysym].append(e)
@@ -58,76 +82,214 @@ class Listener:
             else:
                 yield x
 
-    def triggered(self, map_entry):
-        if map_entry is None:
-            return None
+    def start(self):
+        self.current = self
+        self.enter()
+        if self.states:
+            # window of the chords
+            self.knox.overlay
+        self.knox.keymap_listeners.append(self.keymap_changed)
+        self.handler_key = self.event_loop.register(
+            Event.READABLE, self.next_event, fd=self.knox)
+        print("Starting level %d listener" % self.level)
+
+    def stop(self):
+        self.knox.keymap_listeners.remove(self.keymap_changed)
+        self.event_loop.unregister(self.handler_key)
+        self.back_to_start()
+        self.leave()
+
+    def listen(self):
+        """Process X events until the event loop is told to quit"""
+        self.start()
+        for event in self.event_loop.process():
+            self.feed(event)
+        self.stop()
+
+    async def alisten(self):
+        """Same as listen, with an AsyncioEventLoop in an already running
+        asyncio loop"""
+        self.start()
+        async for event in self.event_loop.aprocess():
+            self.feed(event)
+        self.stop()
+
+    def feed(self, event):
+        """Step the chord state machine with an X event"""
+        state = self.current
+        if event.type == X.KeyPress:
+            entry = state.key_press(event)
+            if self.grab_mode == 'any-modifier':
+                self.allow_events(event, state is self and entry is not None)
+            if entry is not None:
+                self.triggered(state, entry)
+        elif event.type == X.KeyRelease:
+            if state.key_release(event):
+                # nothing was triggered in this level
+                self.back_to_start()
+        else: # mouse button or whatever else
+            pass
+
+    def triggered(self, state, map_entry):
         #print("Triggered: %s" % map_entry.waiter.name)
-        if self.x_state:
-            self.knox.restore_state(self.x_state)
+        # the timer of the level being left
+        self.cancel_timer()
+        if state is not self:
+            state.leave()
+        if state.x_state:
+            self.knox.restore_state(state.x_state)
         #print("Executing triggered: %s" % map_entry.waiter.name)
-        map_entry.trigger.execute(x_state=self.x_state)
-        if map_entry.trigger in self.chained_listeners:
-            self.chained_listeners[map_entry.trigger].listen()
+        map_entry.trigger.execute(x_state=state.x_state)
+        next_state = state.chained_listeners.get(map_entry.trigger)
+        if next_state is None:
+            self.current = self
+        elif next_state.enter() is False:
+            # no keys would come for it
+            print("Cannot enter level %d" % next_state.level)
+            next_state.leave()
+            self.current = self
+        else:
+            self.current = next_state
+            if next_state.timeout:
+                self.timer_key = self.event_loop.call_later(
+                    next_state.timeout, self.state_timeout, state=next_state)
+            print("Entered level %d" % next_state.level)
+
+    def state_timeout(self, event, event_loop):
+        self.timer_key = None
+        if self.current is event.state:
+            print("Timeout on level %d" % self.current.level)
+            self.back_to_start()
+
+    def cancel_timer(self):
+        if self.timer_key is not None:
+            self.event_loop.unregister(self.timer_key)
+            self.timer_key = None
+
+    def back_to_start(self):
+        self.cancel_timer()
+        if self.current is not self:
+            self.current.leave()
+            self.current = self
+
+    def enter(self):
+        """Returns False if the level can't be used"""
+        pass
+
+    def leave(self):
+        pass
+
+    def key_press(self, event):
+        """Returns the MapEntry triggered by the event, if any"""
+        return self.find_entry(keycode=event.detail, state=event.state)
+
+    def key_release(self, event):
+        """Returns True if this state should be left without triggering
+        anything"""
+        return False
+
+    def build_table(self):
+        """Dense table of the map entries indexed by keycode and the modifier
+        bits of the state which are in the mask of any entry of this level.
+        A key press is looked up with a single read."""
+        relevant = 0
+        for e in itertools.chain(*self.event_map.values()):
+            relevant |= e.mask_bits
+        bits = [ b for b in range(8) if relevant & (1 << b) ]
+        width = 1 << len(bits)
+        # state & 0xff -> column
+        self.state_column = [
+            sum(((state >> b) & 1) << i for (i, b) in enumerate(bits))
+            for state in range(256) ]
+        # column -> modifier bits
+        self.column_bits = [
+            sum(((column >> i) & 1) << b for (i, b) in enumerate(bits))
+            for column in range(width) ]
+        (min_keycode, max_keycode) = self.knox.keycode_range
+        self.table = [ None ] * ((max_keycode + 1) * width)
+        self.table_width = width
+        self.update_table(range(min_keycode, max_keycode + 1))
+
+    def update_table(self, keycodes):
+        """Fill the rows of these keycodes in the table again"""
+        table = self.table
+        width = self.table_width
+        for keycode in keycodes:
+            row = keycode * width
+            if row >= len(table):
+                continue
+            table[row:row + width] = [ None ] * width
+            # different keysyms for the same keycode, for example
+            # upper and a lowercase letters...
+            for keysym in self.knox.keycode_to_keysym(keycode):
+                for em in self.event_map.get(keysym, ()):
+                    for (column, mods) in enumerate(self.column_bits):
+                        if (table[row + column] is None
+                            and mods & em.mask_bits == em.modifier_bits):
+                            table[row + column] = em
+        self.table_serial = self.knox.keymap_serial
+
+    def keymap_changed(self, keycodes, modifiers_changed):
+        """Called by KnoX when the keyboard mapping changes. Only the rows of
+        the changed keycodes are refreshed, and only grabs on keycodes which
+        changed are sent again."""
+        for state in [ self ] + list(self.states.values()):
+            if state.table is not None and not modifiers_changed:
+                state.update_table(keycodes)
+        if modifiers_changed:
+            # bits may have moved, the tables are rebuilt on next use
+            return
+        # grabs of keysyms whose keycode changed
+        self.enter()
 
     def find_entry(self, keysym=None, keycode=None, state=None):
         if keysym is not None:
-            keysyms = [ keysym ]
-        elif keycode is not None:
-            keysyms = self.knox.keycode_to_keysym(keycode)
-
-        for keysym in keysyms:
-            print("KEY %s, state %s"
-                  % (self.knox.keysym_to_string(keysym),
-                     Modifiers(self.knox, None) | state))
-            if keysym not in self.event_map:
-                # different keysyms for the same keycode, for example
-                # upper and a lowercase letters...
-                continue
-            for em in self.event_map[keysym]:
+            for em in self.event_map.get(keysym, ()):
                 if state & em.mask_bits == em.modifier_bits:
                     return em
-        return None
+            return None
+        if self.table_serial != self.knox.keymap_serial:
+            self.build_table()
+        em = self.table[keycode * self.table_width + self.state_column[state & 0xff]]
+        if em is not None:
+            print("KEY %s" % em.trigger.key)
+        return em
 
 
 class XKeyListener(Listener):
 
-    def listen(self):
-        self.grab_key_errors = None
-        with self.knox.silenced_error(error.BadAccess):
-            for e in itertools.chain(*self.event_map.values()):
-                #print("Grab: %s (%s)" % (e.waiter.trigger, bin(e.filter_mod_bits)))
-                self.knox.root.grab_key(
-                    self.knox.keysym_to_keycode(e.keysym), e.filter_mod_bits,
-                    True, X.GrabModeAsync, X.GrabModeAsync,
-                    onerror=self.knox.error_handler(self.grab_key_error, e))
-            self.knox.sync()
-
-        triggered = None
-        handler_key = self.event_loop.register(
-            Event.READABLE, self.next_event, fd=self.knox)
-        print("Starting level %d listener" % self.level)
-        for event in self.event_loop.process():
-            if event.type == X.KeyPress:
-                triggered = self.find_entry(keycode=event.detail, state=event.state)
-                if triggered:
-                    self.event_loop.quit()
-            else: # X.KeyRelease or whatever else (mouse button)
-                pass
-        #print("Unregistering %r" % handler_key)
-        self.event_loop.unregister(handler_key)
-
+    def grabs(self):
+        any_modifier = self.grab_mode == 'any-modifier'
+        grabs = dict()
         for e in itertools.chain(*self.event_map.values()):
-            self.knox.root.ungrab_key(
-                self.knox.keysym_to_keycode(e.keysym),
-                e.filter_mod_bits)
-        self.knox.display.flush()
+            keycode = self.knox.keysym_to_keycode(e.keysym)
+            if not keycode:
+                print("No keycode for %s" % e.trigger.key)
+            elif any_modifier:
+                grabs.setdefault((keycode, X.AnyModifier), e)
+            else:
+                grabs[(keycode, e.filter_mod_bits)] = e
+        return grabs
+
+    @property
+    def grab_count(self):
+        return len(self.knox.key_grabs)
 
-        return self.triggered(triggered)
+    def allow_events(self, event, taken):
+        """The keyboard is frozen by the grab, let it go on, and if the key
+        is not taken, it goes to whom it was meant to. Done at every level,
+        a press may come with the grab at a deeper level too, when the
+        overlay couldn't grab the keyboard."""
+        self.knox.display.allow_events(
+            X.AsyncKeyboard if taken else X.ReplayKeyboard, event.time)
+        self.knox.flush()
 
+    def enter(self):
+        # grabs of the previous listener are kept, only the difference is
+        # sent to the server
+        self.knox.key_grabs.update(self.grabs(), onerror=self.grab_key_error)
 
-    def grab_key_error(self, map_entry, *args, **kwargs):
-        if self.grab_key_errors is None:
-            self.grab_key_errors = dict()
+    def grab_key_error(self, map_entry):
         key = map_entry.trigger.key
         mask = map_entry.trigger.mask
         #mods = knox.Modifiers(self.knox) & map_entry.modifiers
@@ -137,59 +299,26 @@ class XKeyListener(Listener):
 
 class XListener(Listener):
 
-    def listen(self):
+    def enter(self):
         self.x_state = self.knox.save_state()
-        root = self.knox.root
-        screen = self.knox.screen
-
-        window = root.create_window(
-            10, 10, 400, 400, 1,
-            screen.root_depth,
-            background_pixel=screen.black_pixel,
-            event_mask=X.ExposureMask | X.KeyPressMask | X.KeyReleaseMask)
-        self.knox.set_wm_states(window, [ "above", "skip_pager", "skip_taskbar" ], True)
-        self.knox.set_desktop_for_window(window, self.knox.current_desktop())
-        gc = window.create_gc(
-            foreground=screen.white_pixel,
-            background=screen.black_pixel)
-        self.x_state["Ignore"] = set([ window.id ])
-
-        self.knox.set_opacity(window, 0.5)
-        self.knox.toggle_frame(window, frame=False, wait=False)
-        window.map()
-        self.knox.active_window(window)
-
-        print("EXPOSE")
-        window.fill_rectangle(gc, 40, 40, 300, 300)
-        window.draw_text(gc, 10, 10, "Macilaci picipuci")
-
-        handler_key = self.event_loop.register(
-            Event.READABLE, self.next_event, fd=self.knox)
+        overlay = self.knox.overlay
+        self.x_state["Ignore"] = set([ overlay.id ])
+        self.keydown = 0
+        # the overlay never gets the focus, the keys come only with the grab
+        return overlay.show()
 
-        print("Starting level %d listener" % self.level)
-        triggered = None
-        keydown = 0
-        window.grab_keyboard(X.KeyPressMask | X.KeyReleaseMask,
-                             X.GrabModeAsync, X.GrabModeAsync,
-                             X.CurrentTime)
-        # for e in self.event_map:
-        #     print("MAP: %s" % (e,))
-        for event in self.event_loop.process():
-            print("X Says", event)
-            if event.type == X.Expose:
-                print("EXPOSE")
-            elif event.type == X.KeyPress:
-                print("KEYPRESS @%d" % keydown)
-                keydown += 1
-                triggered = self.find_entry(keycode=event.detail, state=event.state)
-                if triggered:
-                    self.event_loop.quit()
-            elif event.type == X.KeyRelease:
-                print("KEYPRELEASE @%d" % keydown)
-                if keydown:
-                    keydown -= 1
-                    if keydown == 0:
-                        self.event_loop.quit()
-        self.knox.display.ungrab_keyboard(X.CurrentTime)
-        window.destroy()
-        return self.triggered(triggered)
+    def leave(self):
+        self.knox.overlay.hide()
+
+    def key_press(self, event):
+        print("KEYPRESS @%d" % self.keydown)
+        self.keydown += 1
+        return super().key_press(event)
+
+    def key_release(self, event):
+        print("KEYPRELEASE @%d" % self.keydown)
+        if self.keydown:
+            self.keydown -= 1
+            if self.keydown == 0:
+                return True
+        return False
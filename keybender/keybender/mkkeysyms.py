@@ -0,0 +1,49 @@
+"""Writes keysymtab.py, the keysym table Keysyms loads. Run it again when
+python-xlib gets new keysyms:
+
+    python -m keybender.mkkeysyms > keybender/keysymtab.py
+"""
+import sys
+
+# later ones win for keysyms having more than one name
+modules = ("miscellany", "latin1", "xkb", "xf86")
+
+# missing from Xlib.keysymdef.xf86, for some reason...
+extra = { "XK_XF86_AudioMicMute": 0x1008ffb2 }
+
+
+def collect():
+    import importlib
+    names = dict()
+    keysyms = dict()
+    def load(d):
+        for (name, keysym) in d.items():
+            if not (isinstance(name, str)
+                    and name.startswith("XK_")
+                    and isinstance(keysym, int)):
+                continue
+            names[name] = keysym
+            keysyms[keysym] = name
+    for m in modules:
+        d = dict(importlib.import_module("Xlib.keysymdef." + m).__dict__)
+        if m == "xf86":
+            d.update(extra)
+        load(d)
+    return (names, keysyms)
+
+
+def write(out):
+    (names, keysyms) = collect()
+    out.write('"""Generated by mkkeysyms.py from Xlib.keysymdef.%s, do not edit"""\n'
+              % ", ".join(modules))
+    out.write("\nnames = {\n")
+    for (name, keysym) in names.items():
+        out.write("    %r: 0x%x,\n" % (name, keysym))
+    out.write("}\n\nkeysyms = {\n")
+    for (keysym, name) in keysyms.items():
+        out.write("    0x%x: %r,\n" % (keysym, name))
+    out.write("}\n")
+
+
+if __name__ == "__main__":
+    write(sys.stdout)
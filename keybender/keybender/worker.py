@@ -0,0 +1,211 @@
+from keybender.event import Event, EventLoop
+from keybender.knox import KnoX
+from keybender.config import Consultant
+import itertools
+import os
+import queue
+import threading
+import traceback
+
+
+class Mailbox:
+    """Queue between threads which can be waited on with select: a byte is
+    written on a pipe for each message put in it"""
+    def __init__(self):
+        self.queue = queue.Queue()
+        (self.rfd, self.wfd) = os.pipe()
+        os.set_blocking(self.rfd, False)
+        os.set_blocking(self.wfd, False)
+
+    def fileno(self):
+        return self.rfd
+
+    def put(self, message):
+        self.queue.put(message)
+        try:
+            os.write(self.wfd, b'\0')
+        except BlockingIOError:
+            # pipe full, the reader has plenty to wake up for already
+            pass
+
+    def get_all(self):
+        try:
+            while os.read(self.rfd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        messages = []
+        while True:
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        os.close(self.rfd)
+        os.close(self.wfd)
+
+
+class Worker(threading.Thread):
+    """Thread with its own X connection, event loop and copy of the
+    configuration, running Consultant commands so the ones waiting for
+    windows or for the window manager don't hold up the main loop"""
+    def __init__(self, pool, n, config):
+        super().__init__(name="keybender-worker-%d" % n, daemon=True)
+        self.n = n
+        self.pool = pool
+        self.config = config
+        self.inbox = Mailbox()
+        # connection id -> Consultant, each one answers in order
+        self.consultants = dict()
+
+    def run(self):
+        self.knox = KnoX()
+        self.knox.enable_property_cache()
+        self.event_loop = EventLoop()
+        self.event_loop.register(Event.READABLE, self.x_events, fd=self.knox)
+        self.event_loop.register(Event.READABLE, self.messages, fd=self.inbox)
+        self.config = self.configure(self.config)
+        while True:
+            try:
+                for r in self.event_loop.process():
+                    pass
+                return
+            except Exception:
+                # a handler failed, the others still have to be served
+                traceback.print_exc()
+
+    def configure(self, config):
+        config = config.for_connection(self.knox, self.event_loop)
+        config.main_loop = self.main_loop
+        return config
+
+    def main_loop(self, command, argument, reply):
+        self.pool.call_main(reply.responder, command, argument)
+
+    def x_events(self, event, event_loop):
+        # only the handlers of the completions and caches need them
+        while self.knox.next_event(wait=False) is not None:
+            pass
+
+    def messages(self, event, event_loop):
+        for (what, conn, data) in self.inbox.get_all():
+            try:
+                if what == 'lines':
+                    self.incoming(conn, *data)
+                elif what == 'close':
+                    self.consultants.pop(conn, None)
+                elif what == 'config':
+                    self.config = self.configure(data)
+                    # their running and queued commands go on
+                    for consultant in self.consultants.values():
+                        consultant.config = self.config
+                elif what == 'quit':
+                    event_loop.quit()
+            except Exception as e:
+                traceback.print_exc()
+                if what == 'lines':
+                    self.pool.reply(data[1], "Failed\n")
+
+    def incoming(self, conn, lines, responder):
+        consultant = self.consultants.get(conn)
+        if consultant is None:
+            consultant = self.consultants[conn] = Consultant(self.config)
+        consultant.incoming(lines, responder=Reply(self.pool, responder))
+
+
+class Reply:
+    """Responder of a worker's Consultant, the answers are passed to the
+    responder in the main loop"""
+    def __init__(self, pool, responder):
+        self.pool = pool
+        self.responder = responder
+
+    def __call__(self, data):
+        self.pool.reply(self.responder, data)
+
+
+class RemoteConsultant:
+    """Stands for a Consultant in the main thread, passing the lines to a
+    worker. The answers are given to the responder in the main thread."""
+    def __init__(self, pool, worker):
+        self.pool = pool
+        self.worker = worker
+        self.conn = next(pool.connections)
+
+    def incoming(self, lines, responder=None):
+        if responder is None:
+            responder = lambda x: x
+        lines = list(lines)
+        if not self.worker.is_alive():
+            self.worker = self.pool.replace(self.worker)
+        self.worker.inbox.put(('lines', self.conn, (lines, responder)))
+        return len(lines)
+
+    def close(self):
+        # the commands sent so far are still answered
+        self.worker.inbox.put(('close', self.conn, None))
+
+
+class WorkerPool:
+    """Workers answering the queries of the control socket and of the
+    consult children. A connection is served by the same worker all the
+    time, so its answers come in the order of its commands."""
+    def __init__(self, config, event_loop, count=1):
+        # the configuration of the main loop, for the commands run there
+        self.config = config
+        self.event_loop = event_loop
+        self.outbox = Mailbox()
+        self.connections = itertools.count(1)
+        self.workers = [ Worker(self, n, config) for n in range(count) ]
+        self.next_worker = itertools.cycle(range(count))
+        self.event_loop.register(Event.READABLE, self.answers, fd=self.outbox)
+        for w in self.workers:
+            w.start()
+        print("Started %d worker(s)" % count)
+
+    def consultant(self):
+        worker = self.workers[next(self.next_worker)]
+        if not worker.is_alive():
+            worker = self.replace(worker)
+        return RemoteConsultant(self, worker)
+
+    def replace(self, worker):
+        """Start a new worker instead of one which died"""
+        n = worker.n
+        if self.workers[n] is worker:
+            print("Worker %d died, starting a new one" % n)
+            self.workers[n] = Worker(self, n, self.config)
+            self.workers[n].start()
+        return self.workers[n]
+
+    def reply(self, responder, data):
+        """Called from the workers, responder is called from the main loop"""
+        if not isinstance(data, (str, bytes)):
+            # may be a generator, which the worker should run
+            data = list(data)
+        self.outbox.put((responder, data))
+
+    def call_main(self, responder, command, argument):
+        """Called from the workers, the command is run in the main loop.
+        Going through the outbox too, it's answered in order."""
+        self.outbox.put((responder, (command, argument)))
+
+    def answers(self, event, event_loop):
+        for (responder, data) in self.outbox.get_all():
+            if isinstance(data, tuple):
+                consultant = Consultant(self.config)
+                (command, argument) = data
+                consultant.respond(consultant.commands[command](argument),
+                                   responder)
+            else:
+                responder(data)
+
+    def reload(self, config):
+        self.config = config
+        for w in self.workers:
+            w.inbox.put(('config', None, config))
+
+    def stop(self):
+        for w in self.workers:
+            w.inbox.put(('quit', None, None))
@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+from Xlib import error
+from keybender import knox
+
+
+class FakeQueryTree:
+    """Deferred QueryTree like python-xlib's: reply() returns None, the
+    fields are read from the request afterwards"""
+    tree = { 1: [ 2, 3 ], 2: [ 4, 5 ], 3: [ 6 ], 4: [ 7 ] }
+    gone = set()
+    sent = []
+
+    def __init__(self, display, defer, window):
+        self.window = window
+        self.sent.append(window)
+
+    def reply(self):
+        if self.window in self.gone:
+            raise error.BadWindow.__new__(error.BadWindow)
+        self.children = self.tree.get(self.window, [])
+
+
+class WindowTreeTest(unittest.TestCase):
+    def setUp(self):
+        FakeQueryTree.sent = []
+        FakeQueryTree.gone = set()
+        patcher = mock.patch.object(knox.protocol.request, "QueryTree", FakeQueryTree)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.knox = knox.KnoX.__new__(knox.KnoX)
+        self.knox.root = 1
+        self.knox.display = mock.Mock()
+
+    def test_level_by_level(self):
+        self.assertEqual(
+            list(self.knox.window_tree()),
+            [ (1, None, 0), (2, 1, 1), (3, 1, 1), (4, 2, 2), (5, 2, 2),
+              (6, 3, 2), (7, 4, 3) ])
+
+    def test_max_depth(self):
+        self.assertEqual(list(self.knox.window_tree(max_depth=1)),
+                         [ (1, None, 0), (2, 1, 1), (3, 1, 1) ])
+        self.assertEqual(FakeQueryTree.sent, [ 1 ])
+
+    def test_filter_and_prune(self):
+        self.assertEqual(
+            [ w for (w, _, _) in self.knox.window_tree(filter=lambda w, p, l: w != 2) ],
+            [ 1, 3, 6 ])
+        self.assertEqual(
+            [ w for (w, _, _) in self.knox.window_tree(prune=lambda w, p, l: w == 2) ],
+            [ 1, 2, 3, 6 ])
+
+    def test_destroyed_window(self):
+        FakeQueryTree.gone = { 2 }
+        self.assertEqual([ w for (w, _, _) in self.knox.window_tree() ],
+                         [ 1, 2, 3, 6 ])
+
+
+if __name__ == "__main__":
+    unittest.main()